@@ -0,0 +1,334 @@
+"""Lightweight stand-in for the parts of bpy the addons use, to benchmark them outside Blender
+
+Only data structures are faked: collections, layer collections, view layers, scenes,
+assets and their tags. Writes to exclude flags and tag collections are counted, as
+they are the RNA calls that cost the most inside Blender.
+"""
+import sys
+import types
+import math
+
+
+class Counters:
+    """Number of RNA-style writes made through the stand-in"""
+    exclude_writes = 0
+    tag_calls = 0
+
+    @classmethod
+    def reset(cls):
+        cls.exclude_writes = 0
+        cls.tag_calls = 0
+
+
+class IDCollection:
+    """bpy.data.<type> style collection: iterable, indexable by name"""
+    def __init__(self, items=()):
+        self.items = {}
+        for item in items:
+            self.items[item.name] = item
+
+    def __iter__(self):
+        return iter(list(self.items.values()))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def get(self, name, default=None):
+        return self.items.get(name, default)
+
+    def keys(self):
+        return self.items.keys()
+
+    def link(self, item):
+        self.items[item.name] = item
+
+
+class CollectionProperty:
+    """bpy.props.CollectionProperty value: ordered items added with add()"""
+    def __init__(self, item_type=None):
+        self.item_type = item_type or PropertyGroup
+        self.items = []
+
+    def add(self):
+        item = self.item_type()
+        self.items.append(item)
+        return item
+
+    def remove(self, index):
+        del self.items[index]
+
+    def clear(self):
+        self.items.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, name):
+        return any(item.name == name for item in self.items)
+
+
+class ID:
+    def __init__(self, name):
+        self.name = name
+        self.properties = {}
+        self.library = None
+        self.asset_data = None
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+    def __getitem__(self, key):
+        return self.properties[key]
+
+    def __setitem__(self, key, value):
+        self.properties[key] = value
+
+
+class Object(ID):
+    id_type = 'OBJECT'
+
+    def __init__(self, name, obj_type='EMPTY'):
+        super().__init__(name)
+        self.type = obj_type
+        self.users_collection = []
+        self.children = []
+        self.modifiers = []
+        self.material_slots = []
+        self.parent = None
+
+
+class Collection(ID):
+    id_type = 'COLLECTION'
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.children = IDCollection()
+        self.objects = IDCollection()
+
+    @property
+    def all_objects(self):
+        objects = list(self.objects)
+        for child in self.children:
+            objects.extend(child.all_objects)
+        return objects
+
+
+class Mesh(ID):
+    id_type = 'MESH'
+
+
+class Material(ID):
+    id_type = 'MATERIAL'
+
+
+class Camera(ID):
+    id_type = 'CAMERA'
+
+
+class Light(ID):
+    id_type = 'LIGHT'
+
+
+class LayerCollection:
+    """Layer collection mirroring a collection, counting exclude writes
+
+    Like Blender, excluding a layer collection also excludes its children and remembers
+    which of them were excluded before, including it again brings those states back.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+        self.name = collection.name
+        self.children = [LayerCollection(child) for child in collection.children]
+        self._exclude = False
+        self._previously_excluded = False
+
+    @property
+    def exclude(self):
+        return self._exclude
+
+    @exclude.setter
+    def exclude(self, value):
+        Counters.exclude_writes += 1
+        self._exclude = value
+        for child in self.children:
+            child.propagate_exclude(value)
+
+    def propagate_exclude(self, value):
+        if value:
+            self._previously_excluded = self._exclude
+            self._exclude = True
+        else:
+            self._exclude = self._previously_excluded
+            self._previously_excluded = False
+        for child in self.children:
+            child.propagate_exclude(value)
+
+
+class ViewLayer:
+    def __init__(self, scene_collection):
+        self.name = "ViewLayer"
+        self.layer_collection = LayerCollection(scene_collection)
+
+
+class Scene(ID):
+    """Scene with the properties the benchmarked operators read"""
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.view_layers = []
+        self.render_collections_list = CollectionProperty()
+        self.render_collections_list_index = 0
+        self.render_collections_include = "*"
+        self.render_collections_exclude = "tech_*, c_*, lights_all"
+        self.render_collections_parent = None
+        self.render_collections_min_objects = 0
+        self.render_collections_required_property = ""
+        self.render_collections_auto_sync = False
+
+
+class AssetTag:
+    def __init__(self, name):
+        self.name = name
+
+
+class AssetTags:
+    """AssetMetaData.tags, counting every call like an RNA call"""
+    def __init__(self):
+        self.tags = {}
+
+    def new(self, name, skip_if_exists=False):
+        Counters.tag_calls += 1
+        if name in self.tags and skip_if_exists:
+            return self.tags[name]
+        tag = AssetTag(name)
+        self.tags[name] = tag
+        return tag
+
+    def get(self, name, default=None):
+        Counters.tag_calls += 1
+        return self.tags.get(name, default)
+
+    def remove(self, tag):
+        Counters.tag_calls += 1
+        del self.tags[tag.name]
+
+    def __getitem__(self, name):
+        Counters.tag_calls += 1
+        return self.tags[name]
+
+    def __iter__(self):
+        Counters.tag_calls += 1
+        return iter(list(self.tags.values()))
+
+    def __len__(self):
+        return len(self.tags)
+
+
+class AssetMetaData:
+    def __init__(self):
+        self.tags = AssetTags()
+        self.description = ""
+        self.license = ""
+        self.copyright = ""
+        self.author = ""
+
+
+class AssetRepresentation:
+    """Item of context.selected_assets for a local asset"""
+    def __init__(self, datablock):
+        self.name = datablock.name
+        self.id_type = datablock.id_type
+        self.local_id = datablock
+        self.metadata = datablock.asset_data
+
+
+# Registrable base classes
+class Operator:
+    def report(self, level, message):
+        self.last_report = (level, message)
+
+
+class Panel:
+    pass
+
+
+class PropertyGroup:
+    def __init__(self):
+        self.name = ""
+
+
+class UIList:
+    pass
+
+
+class AddonPreferences:
+    pass
+
+
+def property_factory(*args, **kwargs):
+    return kwargs.get("default")
+
+
+def persistent(function):
+    return function
+
+
+class Vector(tuple):
+    """Enough of mathutils.Vector for module level code"""
+    def __new__(cls, values):
+        return super().__new__(cls, values)
+
+    @property
+    def length(self):
+        return math.sqrt(sum(value * value for value in self))
+
+    def normalized(self):
+        length = self.length or 1.0
+        return Vector(value / length for value in self)
+
+    def __neg__(self):
+        return Vector(-value for value in self)
+
+
+def install():
+    """Put the stand-in bpy, mathutils and bmesh modules in sys.modules"""
+    bpy = types.ModuleType("bpy")
+    bpy.types = types.SimpleNamespace(
+        Operator=Operator, Panel=Panel, PropertyGroup=PropertyGroup, UIList=UIList,
+        AddonPreferences=AddonPreferences, Scene=Scene, Collection=Collection, Object=Object,
+        Mesh=Mesh, Material=Material, Camera=Camera, Light=Light,
+    )
+    bpy.props = types.SimpleNamespace(**{
+        name: property_factory for name in (
+            "StringProperty", "BoolProperty", "IntProperty", "FloatProperty", "EnumProperty",
+            "CollectionProperty", "PointerProperty",
+        )
+    })
+    bpy.app = types.SimpleNamespace(
+        handlers=types.SimpleNamespace(persistent=persistent),
+        binary_path="", version=(0, 0, 0),
+    )
+    bpy.data = types.SimpleNamespace(collections=IDCollection(), objects=IDCollection(), filepath="")
+    bpy.context = types.SimpleNamespace(scene=None, view_layer=None)
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    bpy.ops = types.SimpleNamespace()
+
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = Vector
+    bmesh = types.ModuleType("bmesh")
+
+    sys.modules.update(bpy=bpy, mathutils=mathutils, bmesh=bmesh)
+    return bpy
@@ -0,0 +1,411 @@
+"""Benchmarks of the render collections and tagging addons
+
+Outside Blender the addons run against the bpy stand-in of fake_bpy.py:
+    python benchmarks/run_benchmarks.py --output results.json
+
+Inside Blender they run on generated scenes:
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --output results.json
+
+Before timing, checks on small scenes make sure the benchmarked code still gives the right
+results, a failed check ends the run with exit code 1. Compare two runs with
+--compare baseline.json, the exit code is 1 when a benchmark got slower than --threshold times.
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+try:
+    import bpy
+    IN_BLENDER = bool(getattr(bpy.app, "binary_path", ""))
+except ImportError:
+    IN_BLENDER = False
+
+if not IN_BLENDER:
+    import fake_bpy
+    bpy = fake_bpy.install()
+
+import render_collections
+import tagging_addon
+
+
+def measure(run, setup=None, repeat=5):
+    """Best time of several runs in seconds, setup is called before each run and not timed"""
+    best = None
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def collection_name(index):
+    return f"col_{index:05d}"
+
+
+def get_layer_collection(parent_layer_collection, collection_name):
+    """Recursive layer collection search, the baseline of the LayerVisibility name index"""
+    for layer_collection in parent_layer_collection.children:
+        if layer_collection.collection.name == collection_name:
+            return layer_collection
+        found = get_layer_collection(layer_collection, collection_name)
+        if found:
+            return found
+    return None
+
+
+def layer_parents(layer_collection, parents=None):
+    """Parent name of every layer collection below the given one, by name"""
+    parents = {} if parents is None else parents
+    for child in layer_collection.children:
+        parents[child.collection.name] = layer_collection.collection.name
+        layer_parents(child, parents)
+    return parents
+
+
+EXISTING_TAGS = ["Medieval", "fantasy", "prop"]
+LISTED_TAGS = ["fantasy", "wood", "barrel", "lowpoly", "Shakal"]
+EXPECTED_TAGS = {
+    'ADD': {"Medieval", "fantasy", "prop", "wood", "barrel", "lowpoly", "Shakal"},
+    'REMOVE': {"Medieval", "prop"},
+    'REPLACE': {"Medieval", "fantasy", "Prop"},
+}
+
+
+def tag_panel():
+    """Panel fields of the tag operators: the listed tags and the prop to Prop replacement"""
+    return types.SimpleNamespace(
+        tag_list=[types.SimpleNamespace(name=tag) for tag in LISTED_TAGS],
+        old_tag="prop", new_tag="Prop",
+    )
+
+
+class StandInScenes:
+    """Synthetic scenes built from the stand-in data structures"""
+    mode = "stand-in"
+
+    def collection_tree(self, count, branching):
+        """Scene with count collections, each parent holding branching children and one object"""
+        scene = fake_bpy.Scene()
+        collections = []
+        for index in range(count):
+            collection = fake_bpy.Collection(collection_name(index))
+            collection.objects.link(fake_bpy.Object(f"obj_{index:05d}"))
+            parent = scene.collection if index < branching else collections[index // branching - 1]
+            parent.children.link(collection)
+            collections.append(collection)
+        lights = fake_bpy.Collection("lights_all")
+        scene.collection.children.link(lights)
+        collections.append(lights)
+
+        bpy.data.collections = fake_bpy.IDCollection(collections)
+        view_layer = fake_bpy.ViewLayer(scene.collection)
+        return scene, view_layer
+
+    def assets(self, count, tags):
+        assets = []
+        for index in range(count):
+            obj = fake_bpy.Object(f"asset_{index:05d}")
+            obj.asset_data = fake_bpy.AssetMetaData()
+            for tag in tags:
+                obj.asset_data.tags.new(tag)
+            assets.append(fake_bpy.AssetRepresentation(obj))
+        return assets
+
+    def add_collections(self, scene):
+        operator = render_collections.RENDER_OT_add_collections()
+        operator.rebuild = True
+        operator.prune = False
+        operator.execute(types.SimpleNamespace(scene=scene))
+
+    def counters(self):
+        return {"exclude_writes": fake_bpy.Counters.exclude_writes, "tag_calls": fake_bpy.Counters.tag_calls}
+
+    def reset_counters(self):
+        fake_bpy.Counters.reset()
+
+
+class BlenderScenes:
+    """Generated scenes in a real Blender session, reset to an empty file for each size"""
+    mode = "blender"
+
+    def __init__(self):
+        render_collections.register()
+
+    def collection_tree(self, count, branching):
+        bpy.ops.wm.read_homefile(use_empty=True)
+        scene = bpy.context.scene
+        collections = []
+        for index in range(count):
+            collection = bpy.data.collections.new(collection_name(index))
+            collection.objects.link(bpy.data.objects.new(f"obj_{index:05d}", None))
+            parent = scene.collection if index < branching else collections[index // branching - 1]
+            parent.children.link(collection)
+            collections.append(collection)
+        scene.collection.children.link(bpy.data.collections.new("lights_all"))
+        return scene, scene.view_layers[0]
+
+    def assets(self, count, tags):
+        bpy.ops.wm.read_homefile(use_empty=True)
+        assets = []
+        for index in range(count):
+            obj = bpy.data.objects.new(f"asset_{index:05d}", None)
+            obj.asset_mark()
+            for tag in tags:
+                obj.asset_data.tags.new(tag)
+            assets.append(types.SimpleNamespace(local_id=obj, metadata=obj.asset_data))
+        return assets
+
+    def add_collections(self, scene):
+        bpy.ops.render.add_collections_to_list(rebuild=True)
+
+    def counters(self):
+        return {}
+
+    def reset_counters(self):
+        pass
+
+
+def benchmark_layer_lookup(scenes, size, repeat):
+    """Recursive layer collection search against the LayerVisibility name index"""
+    scene, view_layer = scenes.collection_tree(size, branching=8)
+    root = view_layer.layer_collection
+    visibility = render_collections.LayerVisibility(view_layer)
+    last_name = collection_name(size - 1)
+
+    return [
+        {"benchmark": "layer_index_build", "size": size,
+         "seconds": measure(lambda state: render_collections.LayerVisibility(view_layer), repeat=repeat)},
+        {"benchmark": "get_all_layer_collections", "size": size,
+         "seconds": measure(lambda state: visibility.get_all_layer_collections(root), repeat=repeat)},
+        {"benchmark": "get_layer_collection", "size": size,
+         "seconds": measure(lambda state: get_layer_collection(root, last_name), repeat=repeat)},
+        {"benchmark": "layer_index_get", "size": size,
+         "seconds": measure(lambda state: visibility.get(last_name), repeat=repeat)},
+    ]
+
+
+def benchmark_visibility(scenes, size, repeat, toggles=100):
+    """show_only over a run of collections, as the render loop does"""
+    scene, view_layer = scenes.collection_tree(size, branching=8)
+    step = max(1, size // toggles)
+    names = [collection_name(index) for index in range(0, size, step)][:toggles]
+
+    def setup():
+        scenes.reset_counters()
+        return render_collections.LayerVisibility(view_layer)
+
+    def run(visibility):
+        for name in names:
+            visibility.show_only([name, "lights_all"])
+        visibility.restore()
+
+    seconds = measure(run, setup, repeat)
+    result = {"benchmark": "visibility_toggle", "size": size, "toggles": len(names), "seconds": seconds}
+    result.update(scenes.counters())
+    return [result]
+
+
+def benchmark_render_list(scenes, size, repeat):
+    """Filtered render list building of RENDER_OT_add_collections, full and incremental"""
+    scene, view_layer = scenes.collection_tree(size, branching=8)
+    collection_filter = render_collections.CollectionFilter.from_scene(scene)
+
+    def sync(state):
+        render_collections.sync_render_list(scene, collection_filter, candidates=[])
+
+    return [
+        {"benchmark": "add_collections_rebuild", "size": size,
+         "seconds": measure(lambda state: scenes.add_collections(scene), repeat=repeat)},
+        {"benchmark": "render_list_sync_unchanged", "size": size, "seconds": measure(sync, repeat=repeat)},
+    ]
+
+
+def benchmark_tags(scenes, count, repeat):
+    """Tag changesets of the add, remove and replace operators over many assets"""
+    panel = tag_panel()
+    results = []
+    for operation in ('ADD', 'REMOVE', 'REPLACE'):
+        panel.library_operation = operation
+        operations = tagging_addon.tag_operations_from_scene(panel)
+
+        def setup():
+            assets = scenes.assets(count, EXISTING_TAGS)
+            scenes.reset_counters()
+            return assets
+
+        def run(assets):
+            changeset = tagging_addon.TagChangeset((asset.metadata, operations) for asset in assets)
+            changeset.apply()
+
+        result = {"benchmark": f"tags_{operation.lower()}", "size": count, "seconds": measure(run, setup, repeat)}
+        result.update(scenes.counters())
+        results.append(result)
+    return results
+
+
+def ancestor_chain(name, parents):
+    """Names of the collections containing the given one, up to the scene collection"""
+    chain = []
+    while name in parents:
+        name = parents[name]
+        chain.append(name)
+    return chain
+
+
+def check_visibility(scenes):
+    """show_only leaves exactly the shown collections, their parents and their contents included"""
+    scene, view_layer = scenes.collection_tree(100, branching=4)
+    parents = layer_parents(view_layer.layer_collection)
+    layers = {name: get_layer_collection(view_layer.layer_collection, name) for name in parents}
+    visibility = render_collections.LayerVisibility(view_layer)
+
+    failures = []
+    for shown in ([collection_name(5), "lights_all"], [collection_name(40), collection_name(3)], [collection_name(99)]):
+        visibility.show_only(shown)
+        shown_parents = {parent for shown_name in shown for parent in ancestor_chain(shown_name, parents)}
+        for name, layer in layers.items():
+            # Shown collections, the collections holding them and everything inside them
+            visible = name in shown or name in shown_parents or any(
+                shown_name in ancestor_chain(name, parents) for shown_name in shown
+            )
+            if layer.exclude == visible:
+                failures.append(f"show_only({shown}): {name} exclude is {layer.exclude}")
+
+    visibility.restore()
+    failures.extend(f"restore: {name} stays excluded" for name, layer in layers.items() if layer.exclude)
+    return failures
+
+
+def check_render_list(scenes):
+    """sync_render_list keeps the order and the selected item of the render list"""
+    scene, view_layer = scenes.collection_tree(50, branching=4)
+    collection_filter = render_collections.CollectionFilter.from_scene(scene)
+    render_list = scene.render_collections_list
+    render_list.clear()
+
+    failures = []
+    render_collections.sync_render_list(scene, collection_filter)
+    expected = [collection.name for collection in bpy.data.collections if collection_filter.matches(collection)]
+    if [item.name for item in render_list] != expected:
+        failures.append("sync_render_list: first sync does not list the matching collections in order")
+
+    # Pruning the first item and adding it back moves it to the end, the selected item stays selected
+    scene.render_collections_list_index = 5
+    selected = render_list[5].name
+    pruning_filter = render_collections.CollectionFilter(exclude=f"{expected[0]}, lights_all")
+    steps = (
+        (pruning_filter, True, (0, 1), expected[1:]),
+        (collection_filter, False, (1, 0), expected[1:] + expected[:1]),
+    )
+    for step_filter, prune, counts, expected_names in steps:
+        added_removed = render_collections.sync_render_list(scene, step_filter, prune=prune)
+        names = [item.name for item in render_list]
+        if added_removed != counts or names != expected_names:
+            failures.append(f"sync_render_list(prune={prune}): got {added_removed} and a different order")
+        if names[scene.render_collections_list_index] != selected:
+            failures.append(f"sync_render_list(prune={prune}): selected item changed")
+    return failures
+
+
+def check_tags(scenes):
+    """The add, remove and replace operations leave the expected tags"""
+    panel = tag_panel()
+    failures = []
+    for operation, expected in EXPECTED_TAGS.items():
+        panel.library_operation = operation
+        assets = scenes.assets(3, EXISTING_TAGS)
+        tagging_addon.TagChangeset(
+            (asset.metadata, tagging_addon.tag_operations_from_scene(panel)) for asset in assets
+        ).apply()
+        for asset in assets:
+            tags = {tag.name for tag in asset.metadata.tags}
+            if tags != expected:
+                failures.append(f"tags_{operation.lower()}: got {sorted(tags)}, expected {sorted(expected)}")
+    return failures
+
+
+def compare(results, baseline_path, threshold):
+    """Print the time ratio of every benchmark against a previous run, return those above the threshold"""
+    with open(baseline_path) as baseline_file:
+        baseline = {
+            (result["benchmark"], result["size"]): result["seconds"]
+            for result in json.load(baseline_file)["results"]
+        }
+
+    regressions = []
+    print(f"{'benchmark':32} {'size':>7} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for result in results:
+        before = baseline.get((result["benchmark"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before if before else float("inf")
+        flag = " slower" if ratio > threshold else ""
+        print(f"{result['benchmark']:32} {result['size']:>7} {before:>12.6f} {result['seconds']:>12.6f} {ratio:>7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file the results are written to")
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma separated collection counts")
+    parser.add_argument("--assets", type=int, default=10000, help="Number of assets of the tag benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the best one is kept")
+    parser.add_argument("--compare", help="Previous results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=1.5,
+        help="Time ratio against the compared results above which a benchmark counts as a regression"
+    )
+    args = parser.parse_args(argv)
+
+    scenes = BlenderScenes() if IN_BLENDER else StandInScenes()
+    failures = check_visibility(scenes) + check_render_list(scenes) + check_tags(scenes)
+    for failure in failures:
+        print(f"FAILED {failure}")
+    if failures:
+        return 1
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = []
+    for size in sizes:
+        results.extend(benchmark_layer_lookup(scenes, size, args.repeat))
+        results.extend(benchmark_visibility(scenes, size, args.repeat))
+        results.extend(benchmark_render_list(scenes, size, args.repeat))
+    results.extend(benchmark_tags(scenes, args.assets, args.repeat))
+
+    for result in results:
+        print(f"{result['benchmark']:32} {result['size']:>7} {result['seconds']:>12.6f}s")
+
+    report = {
+        "mode": scenes.mode,
+        "blender": ".".join(map(str, bpy.app.version)) if IN_BLENDER else None,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=4)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) more than {args.threshold}x slower than {args.compare}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]))
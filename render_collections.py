@@ -1,5 +1,25 @@
 import bpy
 import os
+import sys
+import argparse
+import json
+import subprocess
+import tempfile
+import hashlib
+import array
+import fnmatch
+import time
+import re
+import csv
+import shutil
+import struct
+import zlib
+import math
+import platform
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
 
 bl_info = {
     "name": "Render Collections with Line Art",
@@ -11,21 +31,182 @@ bl_info = {
     "category": "Render",
 }
 
+def compile_patterns(text):
+    """Comma separated glob patterns, or regular expressions prefixed with re:"""
+    patterns = []
+    for pattern in text.split(","):
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if pattern.startswith("re:"):
+            patterns.append(re.compile(pattern[3:]))
+        else:
+            patterns.append(re.compile(fnmatch.translate(pattern)))
+    return patterns
+
+def get_child_collections(collection):
+    """Recursively get all collections below a collection"""
+    children = []
+    for child in collection.children:
+        children.append(child)
+        children.extend(get_child_collections(child))
+    return children
+
+
+class CollectionFilter:
+    """Include and exclude rules deciding which collections belong in the render list"""
+
+    def __init__(self, include="*", exclude="", parent=None, min_objects=0, required_property=""):
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+        self.allowed = None if parent is None else {child.name for child in get_child_collections(parent)}
+        self.min_objects = min_objects
+        self.required_property = required_property
+
+    @classmethod
+    def from_scene(cls, scene):
+        return cls(
+            include=scene.render_collections_include,
+            exclude=scene.render_collections_exclude,
+            parent=scene.render_collections_parent,
+            min_objects=scene.render_collections_min_objects,
+            required_property=scene.render_collections_required_property,
+        )
+
+    def matches(self, collection):
+        name = collection.name
+        if self.include and not any(pattern.match(name) for pattern in self.include):
+            return False
+        if any(pattern.match(name) for pattern in self.exclude):
+            return False
+        if self.allowed is not None and name not in self.allowed:
+            return False
+        if self.required_property and not collection.get(self.required_property):
+            return False
+        # Counting objects is the most expensive check, so it comes last
+        if self.min_objects and len(collection.all_objects) < self.min_objects:
+            return False
+        return True
+
+
+def sync_render_list(scene, collection_filter, candidates=None, prune=False):
+    """Merge matching collections into the render list, keeping its order and the selected item
+
+    Only the candidates are checked for new entries (all collections when None).
+    Returns the number of added and removed items.
+    """
+    render_list = scene.render_collections_list
+    index = scene.render_collections_list_index
+    selected = render_list[index].name if 0 <= index < len(render_list) else None
+
+    # Drop deleted collections, and those no longer matching the rules when pruning
+    removed = 0
+    for item_index in reversed(range(len(render_list))):
+        collection = bpy.data.collections.get(render_list[item_index].name)
+        if collection is None or (prune and not collection_filter.matches(collection)):
+            render_list.remove(item_index)
+            removed += 1
+
+    listed = {item.name for item in render_list}
+    added = 0
+    for collection in bpy.data.collections if candidates is None else candidates:
+        if collection.name not in listed and collection_filter.matches(collection):
+            item = render_list.add()
+            item.name = collection.name
+            listed.add(collection.name)
+            added += 1
+
+    if selected is not None:
+        for item_index, item in enumerate(render_list):
+            if item.name == selected:
+                scene.render_collections_list_index = item_index
+                break
+        else:
+            scene.render_collections_list_index = max(0, min(index, len(render_list) - 1))
+
+    return added, removed
+
+
+# Collection names seen by the auto sync handler, per scene
+known_collections = {}
+
+@bpy.app.handlers.persistent
+def auto_sync_render_list(scene, depsgraph=None):
+    """Keep the render list in sync with added, renamed and deleted collections"""
+    if not scene.render_collections_auto_sync:
+        return
+
+    known = known_collections.get(scene.name)
+    if known is not None and len(known) == len(bpy.data.collections):
+        if depsgraph is not None and not depsgraph.id_type_updated('COLLECTION'):
+            return
+
+    names = set(bpy.data.collections.keys())
+    if names == known:
+        return
+    known_collections[scene.name] = names
+
+    try:
+        collection_filter = CollectionFilter.from_scene(scene)
+    except re.error:
+        return  # Reported when the list is updated from the panel
+
+    # Only collections that appeared since the last update need the rules
+    candidates = None if known is None else [bpy.data.collections[name] for name in names - known]
+
+    # One name gone and one new is a rename, keep the item where it is in the list
+    if known is not None and len(names - known) == 1 and len(known - names) == 1:
+        old_name = next(iter(known - names))
+        collection = candidates[0]
+        item = next((item for item in scene.render_collections_list if item.name == old_name), None)
+        if item is not None and collection_filter.matches(collection):
+            item.name = collection.name
+            candidates = []
+
+    sync_render_list(scene, collection_filter, candidates)
+
+@bpy.app.handlers.persistent
+def clear_known_collections(dummy):
+    """Forget the collections seen in the previous file, its scene names may come back"""
+    known_collections.clear()
+
+def update_auto_sync(self, context):
+    known_collections.pop(context.scene.name, None)
+    if context.scene.render_collections_auto_sync:
+        auto_sync_render_list(context.scene)
+
+
 class RENDER_OT_add_collections(bpy.types.Operator):
-    """Add all collections to the render list"""
+    """Add collections matching the filter rules to the render list"""
     bl_idname = "render.add_collections_to_list"
-    bl_label = "Add All Collections to List"
+    bl_label = "Add Collections to List"
+
+    rebuild: bpy.props.BoolProperty(
+        name="Rebuild",
+        description="Clear the list before adding the matching collections",
+        default=False
+    )
+    prune: bpy.props.BoolProperty(
+        name="Remove Unmatched",
+        description="Remove listed collections that no longer match the filter rules",
+        default=False
+    )
     
     def execute(self, context):
         scene = context.scene
-        scene.render_collections_list.clear()
-        
-        for collection in bpy.data.collections:
-            if not collection.name.startswith("tech_") and not collection.name.startswith("c_") and collection.name != "lights_all":
-                item = scene.render_collections_list.add()
-                item.name = collection.name
+        if self.rebuild:
+            scene.render_collections_list.clear()
+
+        try:
+            collection_filter = CollectionFilter.from_scene(scene)
+        except re.error as error:
+            self.report({'ERROR'}, f"Invalid filter pattern: {error}")
+            return {'CANCELLED'}
+
+        added, removed = sync_render_list(scene, collection_filter, prune=self.prune)
+        known_collections.pop(scene.name, None)
                 
-        self.report({'INFO'}, f"Added {len(scene.render_collections_list)} collections to render list.")
+        self.report({'INFO'}, f"Added {added} and removed {removed} collections. {len(scene.render_collections_list)} in the render list.")
         return {'FINISHED'}
 
 class RENDER_OT_remove_collection(bpy.types.Operator):
@@ -46,6 +227,1154 @@ class RENDER_OT_remove_collection(bpy.types.Operator):
         
         return {'FINISHED'}
 
+def plain_value(value):
+    """Convert RNA arrays, vectors and matrices into plain tuples for hashing"""
+    if isinstance(value, (str, bytes)):
+        return value
+    try:
+        return tuple(plain_value(item) for item in value)
+    except TypeError:
+        return value
+
+def hash_rna_properties(hasher, rna_struct, skip=(), depth=2):
+    """Hash the RNA properties of a struct
+
+    Referenced datablocks are hashed by name, other nested structs (like camera depth of field
+    settings) are followed down to the given depth. Collections are left to the callers.
+    """
+    if rna_struct is None:
+        hasher.update(b"None")
+        return
+    for prop in rna_struct.bl_rna.properties:
+        if prop.identifier == "rna_type" or prop.type == 'COLLECTION' or prop.identifier in skip:
+            continue
+        value = getattr(rna_struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.ID):
+                hasher.update(f"{prop.identifier}->{value.name};".encode())
+            elif value is not None and depth > 0 and prop.identifier != "id_data":
+                hasher.update(f"{prop.identifier}{{".encode())
+                hash_rna_properties(hasher, value, depth=depth - 1)
+                hasher.update(b"}")
+            continue
+        hasher.update(f"{prop.identifier}={plain_value(value)!r};".encode())
+
+def hash_id_properties(hasher, owner):
+    """Hash the custom properties of a struct, like the inputs of a Geometry Nodes modifier"""
+    for key in owner.keys():
+        value = owner[key]
+        value = value.name if isinstance(value, bpy.types.ID) else plain_value(value)
+        hasher.update(f"[{key}]={value!r};".encode())
+
+def hash_image(hasher, image):
+    """Hash an image by its path and the size and time of the file on disk, or its packed size"""
+    hasher.update(f"{image.name}:{image.source}:{image.filepath}:{image.is_dirty}".encode())
+    if image.packed_file is not None:
+        hasher.update(f"packed={image.packed_file.size}".encode())
+        return
+    try:
+        stat = os.stat(bpy.path.abspath(image.filepath, library=image.library))
+        hasher.update(f"{stat.st_mtime}:{stat.st_size}".encode())
+    except (OSError, ValueError):
+        hasher.update(b"missing")
+
+def hash_node_tree(hasher, node_tree, seen=None):
+    """Hash the nodes, input values, links, node groups and images of a node tree"""
+    if node_tree is None:
+        hasher.update(b"None")
+        return
+    seen = set() if seen is None else seen
+    if node_tree.name in seen:
+        return
+    seen.add(node_tree.name)
+    for node in node_tree.nodes:
+        hasher.update(node.name.encode())
+        hash_rna_properties(hasher, node)
+        for node_input in node.inputs:
+            if hasattr(node_input, "default_value"):
+                value = node_input.default_value
+                value = value.name if isinstance(value, bpy.types.ID) else plain_value(value)
+                hasher.update(repr(value).encode())
+        if getattr(node, "node_tree", None) is not None:
+            hash_node_tree(hasher, node.node_tree, seen)
+        if getattr(node, "image", None) is not None:
+            hash_image(hasher, node.image)
+    for link in node_tree.links:
+        hasher.update(f"{link.from_node.name}.{link.from_socket.identifier}>{link.to_node.name}.{link.to_socket.identifier}".encode())
+
+def hash_foreach(hasher, items, prop_name, typecode, width=1):
+    """Hash one property of every item of an RNA collection without converting it to Python lists"""
+    values = array.array(typecode, [0]) * (len(items) * width)
+    items.foreach_get(prop_name, values)
+    hasher.update(values.tobytes())
+
+# Attribute data types by the foreach_get property, array type code and width of their values
+ATTRIBUTE_LAYOUTS = {
+    'FLOAT': ("value", 'f', 1),
+    'INT': ("value", 'i', 1),
+    'INT8': ("value", 'b', 1),
+    'BOOLEAN': ("value", 'b', 1),
+    'FLOAT_VECTOR': ("vector", 'f', 3),
+    'FLOAT2': ("vector", 'f', 2),
+    'INT32_2D': ("value", 'i', 2),
+    'FLOAT_COLOR': ("color", 'f', 4),
+    'BYTE_COLOR': ("color", 'f', 4),
+    'QUATERNION': ("value", 'f', 4),
+}
+
+def hash_attributes(hasher, attributes):
+    """Hash the generic attributes of a geometry: UV maps, colors, creases and custom data"""
+    for attribute in sorted(attributes, key=lambda attribute: attribute.name):
+        hasher.update(f"{attribute.name}:{attribute.domain}:{attribute.data_type};".encode())
+        layout = ATTRIBUTE_LAYOUTS.get(attribute.data_type)
+        if layout is not None:
+            hash_foreach(hasher, attribute.data, *layout)
+
+def hash_mesh(hasher, mesh):
+    """Hash the geometry, shading, UV maps and attributes of a mesh without converting it to Python lists"""
+    hash_foreach(hasher, mesh.vertices, "co", 'f', 3)
+    hash_foreach(hasher, mesh.loops, "vertex_index", 'i')
+    hash_foreach(hasher, mesh.polygons, "material_index", 'i')
+    hash_foreach(hasher, mesh.polygons, "use_smooth", 'b')
+    for uv_layer in mesh.uv_layers:
+        hasher.update(uv_layer.name.encode())
+        hash_foreach(hasher, uv_layer.data, "uv", 'f', 2)
+    hash_attributes(hasher, mesh.attributes)
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            hasher.update(f"{key_block.name}:{key_block.value}:{key_block.mute}".encode())
+            hash_foreach(hasher, key_block.data, "co", 'f', 3)
+
+def hash_grease_pencil(hasher, grease_pencil):
+    """Hash the stroke points of a Grease Pencil, legacy strokes or the drawings of Grease Pencil v3"""
+    for layer in grease_pencil.layers:
+        hash_rna_properties(hasher, layer)
+        for frame in layer.frames:
+            hasher.update(f"frame={frame.frame_number};".encode())
+            drawing = getattr(frame, "drawing", None)
+            if drawing is not None:
+                hash_attributes(hasher, drawing.attributes)
+                continue
+            for stroke in frame.strokes:
+                hash_rna_properties(hasher, stroke)
+                hash_foreach(hasher, stroke.points, "co", 'f', 3)
+                hash_foreach(hasher, stroke.points, "pressure", 'f')
+
+# Object types whose evaluated geometry can be read as a mesh
+MESH_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}
+
+def hash_object(hasher, obj, depsgraph=None, seen=None):
+    """Hash the transform, evaluated geometry, modifiers and materials of an object
+
+    Objects used by modifiers (boolean cutters, mirror centers, curves) are hashed as well.
+    Objects outside the depsgraph have their own data hashed, their modifiers through their settings.
+    """
+    seen = set() if seen is None else seen
+    if obj.name in seen:
+        return
+    seen.add(obj.name)
+
+    hasher.update(f"{obj.name}:{obj.type}:{plain_value(obj.matrix_world)!r}:{obj.hide_render}".encode())
+    if obj.type in MESH_TYPES:
+        evaluated = obj.evaluated_get(depsgraph) if depsgraph is not None else obj
+        mesh = evaluated.to_mesh()
+        if mesh is not None:
+            hash_mesh(hasher, mesh)
+        evaluated.to_mesh_clear()
+        if obj.type != 'MESH':
+            hash_rna_properties(hasher, obj.data)
+    elif obj.type in {'GPENCIL', 'GREASEPENCIL'}:
+        hash_grease_pencil(hasher, obj.data)
+    elif obj.data is not None:
+        hash_rna_properties(hasher, obj.data)
+        if hasattr(obj.data, "attributes"):
+            hash_attributes(hasher, obj.data.attributes)
+        if getattr(obj.data, "node_tree", None) is not None:
+            hash_node_tree(hasher, obj.data.node_tree)
+
+    for modifier in list(obj.modifiers) + list(getattr(obj, "grease_pencil_modifiers", ())):
+        hash_rna_properties(hasher, modifier)
+        hash_id_properties(hasher, modifier)
+        if getattr(modifier, "node_group", None) is not None:
+            hash_node_tree(hasher, modifier.node_group)
+        for prop in modifier.bl_rna.properties:
+            if prop.type == 'POINTER' and prop.identifier != "rna_type":
+                target = getattr(modifier, prop.identifier, None)
+                if isinstance(target, bpy.types.Object):
+                    hash_object(hasher, target, depsgraph, seen)
+        for key in modifier.keys():
+            if isinstance(modifier[key], bpy.types.Object):
+                hash_object(hasher, modifier[key], depsgraph, seen)
+
+    for slot in obj.material_slots:
+        material = slot.material
+        if material is None:
+            continue
+        hasher.update(material.name.encode())
+        hash_rna_properties(hasher, material)
+        if material.use_nodes:
+            hash_node_tree(hasher, material.node_tree)
+
+# Render settings changed for every render call, not part of the fingerprint
+RENDER_STATE_PROPERTIES = {"filepath"}
+
+def render_settings_fingerprint(scene):
+    """Fingerprint the render, color management, engine and world settings of a scene"""
+    hasher = hashlib.sha1()
+    hash_rna_properties(hasher, scene.render, skip=RENDER_STATE_PROPERTIES)
+    hash_rna_properties(hasher, scene.render.image_settings)
+    hash_rna_properties(hasher, scene.view_settings)
+    for engine_settings in ("cycles", "eevee"):
+        hash_rna_properties(hasher, getattr(scene, engine_settings, None))
+    if scene.world is not None and scene.world.use_nodes:
+        hash_node_tree(hasher, scene.world.node_tree)
+    return hasher.hexdigest()
+
+def collection_fingerprint(scene, collection_name, render_lineart, camera=None, settings_fingerprint=None):
+    """Fingerprint everything that affects the render of a collection from a camera
+
+    The render settings part can be passed in, snapshot before a run changes them.
+    Geometry is read from the evaluated depsgraph, so modifier results are part of it.
+    """
+    hasher = hashlib.sha1()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    # The collection itself, lights_all and the c_<name> counterpart
+    for name in (collection_name, "lights_all", f"c_{collection_name}"):
+        collection = bpy.data.collections.get(name)
+        hasher.update(f"[{name}:{collection is not None}]".encode())
+        if collection is not None:
+            for obj in sorted(collection.all_objects, key=lambda obj: obj.name):
+                hash_object(hasher, obj, depsgraph)
+
+    # Rendering camera
+    camera = camera or scene.camera
+    if camera is not None:
+        hash_object(hasher, camera, depsgraph)
+    else:
+        hasher.update(b"NoCamera")
+
+    # Render settings and world
+    hasher.update((settings_fingerprint or render_settings_fingerprint(scene)).encode())
+
+    # Line art setup
+    hasher.update(f"lineart={render_lineart}".encode())
+    if render_lineart:
+        tech_ink = bpy.data.collections.get("tech_ink")
+        if tech_ink is not None:
+            for obj in sorted(tech_ink.all_objects, key=lambda obj: obj.name):
+                hash_object(hasher, obj, depsgraph)
+
+    return hasher.hexdigest()
+
+
+def find_cameras(scene, pattern):
+    """Cameras of the scene matching a name pattern, or the active camera when the pattern is empty"""
+    if not pattern:
+        return [scene.camera]
+    return sorted(
+        (obj for obj in scene.objects if obj.type == 'CAMERA' and fnmatch.fnmatchcase(obj.name, pattern)),
+        key=lambda obj: obj.name
+    )
+
+class PreviewSettings:
+    """Reduced quality render settings for quick preview sweeps, restored exactly afterwards"""
+
+    def __init__(self, resolution_percentage=25, samples=16, simplify_subdivision=0, denoise=True, contact_sheet=False):
+        self.resolution_percentage = resolution_percentage
+        self.samples = samples
+        self.simplify_subdivision = simplify_subdivision
+        self.denoise = denoise
+        self.contact_sheet = contact_sheet
+        self.original_values = []
+
+    def apply(self, scene):
+        render = scene.render
+        values = [
+            (render, "resolution_percentage", self.resolution_percentage),
+            (render, "use_simplify", True),
+            (render, "simplify_subdivision_render", self.simplify_subdivision),
+        ]
+        cycles = getattr(scene, "cycles", None)
+        if cycles is not None:
+            values.append((cycles, "samples", self.samples))
+            values.append((cycles, "use_denoising", self.denoise))
+        if hasattr(scene, "eevee"):
+            values.append((scene.eevee, "taa_render_samples", self.samples))
+
+        self.original_values = []
+        for owner, attribute, value in values:
+            self.original_values.append((owner, attribute, getattr(owner, attribute)))
+            setattr(owner, attribute, value)
+
+    def restore(self, scene):
+        for owner, attribute, value in reversed(self.original_values):
+            setattr(owner, attribute, value)
+        self.original_values = []
+
+
+def scene_output_path(scene, output_path=None, tier=None):
+    """Absolute output folder, with a subfolder for the render tier"""
+    output_path = bpy.path.abspath(output_path or scene.render_collections_output_path)
+    return os.path.join(output_path, (tier or scene.render_collections_tier).lower())
+
+def write_contact_sheet(output_path, matrix, cell_size=256):
+    """Put the beauty image of every rendered collection and camera into one image"""
+    image_paths = []
+    for collection_name in sorted(matrix):
+        for camera_name in sorted(matrix[collection_name]):
+            files = matrix[collection_name][camera_name]
+            if files and os.path.exists(os.path.join(output_path, files[0])):
+                image_paths.append(os.path.join(output_path, files[0]))
+    if not image_paths:
+        return None
+
+    columns = math.ceil(math.sqrt(len(image_paths)))
+    rows = math.ceil(len(image_paths) / columns)
+    sheet = numpy.zeros((rows * cell_size, columns * cell_size, 4), dtype=numpy.float32)
+
+    for image_index, image_path in enumerate(image_paths):
+        image = bpy.data.images.load(image_path, check_existing=False)
+        width, height = image.size
+        pixels = numpy.empty(width * height * 4, dtype=numpy.float32)
+        image.pixels.foreach_get(pixels)
+        bpy.data.images.remove(image)
+
+        # Nearest neighbour scaling is enough for a contact sheet
+        scale = min(cell_size / width, cell_size / height)
+        cell_width, cell_height = max(1, int(width * scale)), max(1, int(height * scale))
+        ys = numpy.minimum((numpy.arange(cell_height) / scale).astype(int), height - 1)
+        xs = numpy.minimum((numpy.arange(cell_width) / scale).astype(int), width - 1)
+        cell = pixels.reshape(height, width, 4)[ys][:, xs]
+
+        # Blender images start at the bottom left, so the first row goes on top
+        row, column = divmod(image_index, columns)
+        y = (rows - 1 - row) * cell_size
+        x = column * cell_size
+        sheet[y:y + cell_height, x:x + cell_width] = cell
+
+    sheet_path = os.path.join(output_path, "contact_sheet.png")
+    sheet_image = bpy.data.images.new("contact_sheet", columns * cell_size, rows * cell_size, alpha=True)
+    sheet_image.pixels.foreach_set(sheet.ravel())
+    sheet_image.filepath_raw = sheet_path
+    sheet_image.file_format = 'PNG'
+    sheet_image.save()
+    bpy.data.images.remove(sheet_image)
+    return sheet_path
+
+
+def scene_render_options(scene, tier=None):
+    """CollectionRenderer options set in the panel, plain values so they can be passed to workers"""
+    preview = None
+    if (tier or scene.render_collections_tier) == 'PREVIEW':
+        preview = {
+            "resolution_percentage": scene.render_collections_preview_resolution,
+            "samples": scene.render_collections_preview_samples,
+            "simplify_subdivision": scene.render_collections_preview_subdivision,
+            "denoise": scene.render_collections_preview_denoise,
+            "contact_sheet": scene.render_collections_contact_sheet,
+        }
+    return {
+        "preview": preview,
+        "single_pass": scene.render_collections_single_pass,
+        "camera_folders": scene.render_collections_camera_folders,
+        "file_format": scene.render_collections_file_format,
+        "compression": scene.render_collections_compression,
+        "async_write": scene.render_collections_async_write,
+        "composite_lineart": scene.render_collections_composite_lineart,
+        "thumbnail_size": scene.render_collections_thumbnail_size,
+    }
+
+def write_render_matrix(output_path, matrix):
+    """Write the collection x camera table of rendered images next to the renders"""
+    with open(os.path.join(output_path, "render_matrix.json"), "w") as matrix_file:
+        json.dump(matrix, matrix_file, indent=1, sort_keys=True)
+
+
+class RenderCache:
+    """Collection fingerprints of the last renders, stored next to the images"""
+    file_name = ".render_cache.json"
+
+    def __init__(self, output_path):
+        self.path = os.path.join(output_path, self.file_name)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as cache_file:
+                    self.entries = json.load(cache_file)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_current(self, key, fingerprint, output_files):
+        """Check if the image was rendered from the same fingerprint and still exists"""
+        return self.entries.get(key) == fingerprint and all(os.path.exists(path) for path in output_files)
+
+    def update(self, key, fingerprint):
+        self.entries[key] = fingerprint
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as cache_file:
+            json.dump(self.entries, cache_file, indent=1, sort_keys=True)
+
+
+def process_peak_memory():
+    """Peak resident memory of the Blender process in MB, None where the resource module is missing"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if platform.system() == "Darwin" else peak / 1024.0
+
+class RenderProfiler:
+    """Timing, memory and size of every render pass, written as a report next to the images
+
+    Blender only reports render memory through render_stats in background mode. In the
+    interface the process peak so far is recorded instead, noted in memory_source.
+    """
+    fields = [
+        "collection", "camera", "pass", "toggle_time", "render_time", "wall_time",
+        "peak_memory_mb", "memory_source", "objects", "polygons", "file_size",
+    ]
+
+    def __init__(self):
+        self.entries = []
+        self.entry_files = []
+        self.peak_memory = 0.0
+        self.collection_stats = {}
+
+    def start(self):
+        bpy.app.handlers.render_stats.append(self.on_render_stats)
+
+    def stop(self):
+        if self.on_render_stats in bpy.app.handlers.render_stats:
+            bpy.app.handlers.render_stats.remove(self.on_render_stats)
+
+    def on_render_stats(self, *args):
+        """Keep the highest peak memory reported while the current pass renders"""
+        stats = next((arg for arg in args if isinstance(arg, str)), "")
+        match = re.search(r"Peak[: ]+([\d.]+)([KMG])", stats)
+        if match:
+            scale = {"K": 1.0 / 1024.0, "M": 1.0, "G": 1024.0}[match.group(2)]
+            self.peak_memory = max(self.peak_memory, float(match.group(1)) * scale)
+
+    def get_collection_stats(self, collection_name):
+        """Object and polygon count of a collection, counted once per run"""
+        if collection_name not in self.collection_stats:
+            collection = bpy.data.collections.get(collection_name)
+            objects = list(collection.all_objects) if collection else []
+            polygons = sum(len(obj.data.polygons) for obj in objects if obj.type == 'MESH')
+            self.collection_stats[collection_name] = (len(objects), polygons)
+        return self.collection_stats[collection_name]
+
+    def record(self, collection_name, camera_name, pass_name, toggle_time, render_time, output_files):
+        objects, polygons = self.get_collection_stats(collection_name)
+        peak_memory, memory_source = self.peak_memory, "render"
+        if not peak_memory:
+            peak_memory, memory_source = process_peak_memory(), "process"
+            if peak_memory is None:
+                peak_memory, memory_source = 0.0, ""
+        self.entries.append({
+            "collection": collection_name,
+            "camera": camera_name,
+            "pass": pass_name,
+            "toggle_time": round(toggle_time, 4),
+            "render_time": round(render_time, 4),
+            "wall_time": round(toggle_time + render_time, 4),
+            "peak_memory_mb": round(peak_memory, 2),
+            "memory_source": memory_source,
+            "objects": objects,
+            "polygons": polygons,
+            "file_size": 0,
+        })
+        self.entry_files.append(output_files)
+        self.peak_memory = 0.0
+
+    def update_file_sizes(self):
+        """Measure the written images, once background encoding has finished"""
+        for entry, output_files in zip(self.entries, self.entry_files):
+            entry["file_size"] = sum(os.path.getsize(path) for path in output_files if os.path.exists(path))
+
+    def summary(self):
+        """Totals per collection, the most expensive first"""
+        totals = {}
+        for entry in self.entries:
+            total = totals.setdefault(entry["collection"], {
+                "collection": entry["collection"], "passes": 0, "toggle_time": 0.0, "render_time": 0.0,
+                "wall_time": 0.0, "peak_memory_mb": 0.0, "objects": entry["objects"],
+                "polygons": entry["polygons"], "file_size": 0,
+            })
+            total["passes"] += 1
+            for key in ("toggle_time", "render_time", "wall_time", "file_size"):
+                total[key] += entry[key]
+            total["peak_memory_mb"] = max(total["peak_memory_mb"], entry["peak_memory_mb"])
+        return sorted(totals.values(), key=lambda total: total["wall_time"], reverse=True)
+
+    def write(self, output_path):
+        """Write render_profile.json with passes and summary, and render_profile.csv with the passes"""
+        os.makedirs(output_path, exist_ok=True)
+        with open(os.path.join(output_path, "render_profile.json"), "w") as report_file:
+            json.dump({"passes": self.entries, "summary": self.summary()}, report_file, indent=1)
+
+        with open(os.path.join(output_path, "render_profile.csv"), "w", newline="") as report_file:
+            writer = csv.DictWriter(report_file, fieldnames=self.fields)
+            writer.writeheader()
+            writer.writerows(self.entries)
+
+
+def read_tga(path):
+    """Read an uncompressed Targa file as a top-down RGB(A) array"""
+    with open(path, "rb") as image_file:
+        data = image_file.read()
+
+    id_length, image_type = data[0], data[2]
+    width, height, bits_per_pixel, descriptor = struct.unpack("<HHBB", data[12:18])
+    if image_type != 2 or bits_per_pixel not in (24, 32):
+        raise OSError(f"Unsupported Targa file: {path}")
+
+    channels = bits_per_pixel // 8
+    offset = 18 + id_length
+    pixels = numpy.frombuffer(data, dtype=numpy.uint8, count=width * height * channels, offset=offset)
+    pixels = pixels.reshape(height, width, channels)
+
+    # Targa stores BGR(A), bottom row first unless bit 5 of the descriptor is set
+    pixels = pixels[:, :, [2, 1, 0, 3][:channels]]
+    if not descriptor & 0x20:
+        pixels = pixels[::-1]
+    return numpy.ascontiguousarray(pixels)
+
+def write_png(path, pixels, compression):
+    """Encode an RGB(A) array as PNG, zlib does the heavy lifting without holding the GIL"""
+    height, width, channels = pixels.shape
+    rows = numpy.empty((height, width * channels + 1), dtype=numpy.uint8)
+    rows[:, 0] = 0  # No filter
+    rows[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(tag, body):
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF)
+
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    level = round(compression * 9 / 100)
+    with open(path, "wb") as image_file:
+        image_file.write(b"\x89PNG\r\n\x1a\n")
+        image_file.write(chunk(b"IHDR", header))
+        image_file.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), level)))
+        image_file.write(chunk(b"IEND", b""))
+
+def alpha_over(background, foreground):
+    """Composite an RGBA image over another of the same size"""
+    background = background.astype(numpy.float32) / 255.0
+    foreground = foreground.astype(numpy.float32) / 255.0
+    alpha = foreground[:, :, 3:4]
+    result = numpy.empty_like(background)
+    result[:, :, :3] = foreground[:, :, :3] * alpha + background[:, :, :3] * (1.0 - alpha)
+    result[:, :, 3:4] = alpha + background[:, :, 3:4] * (1.0 - alpha)
+    return (result * 255.0 + 0.5).astype(numpy.uint8)
+
+def make_thumbnail(pixels, size):
+    """Downscale by averaging blocks so the longest side is at most size pixels"""
+    height, width, channels = pixels.shape
+    factor = max(1, -(-max(height, width) // size))
+    # Pad with the edge pixels up to whole blocks, so a side shorter than a block still gives one pixel
+    padded_height, padded_width = -(-height // factor) * factor, -(-width // factor) * factor
+    pixels = numpy.pad(pixels, ((0, padded_height - height), (0, padded_width - width), (0, 0)), mode="edge")
+    blocks = pixels.reshape(padded_height // factor, factor, padded_width // factor, factor, channels)
+    return blocks.mean(axis=(1, 3)).astype(numpy.uint8)
+
+
+class ImageWriter:
+    """Encode rendered images on background threads while the next collection renders
+
+    Blender writes every pass as uncompressed Targa, which is quick, the threads then
+    encode the final PNG or WebP and build the optional line art composite and thumbnail.
+    """
+    extensions = {'PNG': "png", 'WEBP': "webp"}
+
+    def __init__(self, file_format, compression, composite_lineart=False, thumbnail_size=0, threads=None):
+        self.file_format = file_format
+        self.compression = compression
+        self.composite_lineart = composite_lineart
+        self.thumbnail_size = thumbnail_size
+        self.executor = ThreadPoolExecutor(max_workers=threads or min(4, os.cpu_count() or 1))
+        self.temp_dir = tempfile.mkdtemp(prefix="render_collections_raw_")
+        self.futures = []
+        self.errors = []
+
+    def intermediate_path(self, output_file):
+        """Uncompressed file Blender renders into instead of the final image"""
+        name = hashlib.sha1(output_file.encode()).hexdigest()
+        return os.path.join(self.temp_dir, f"{name}.tga")
+
+    def submit(self, output_files):
+        """Queue the beauty (and line art) images of one render for encoding"""
+        raw_files = [self.intermediate_path(output_file) for output_file in output_files]
+        self.futures.append((output_files, self.executor.submit(self.process, raw_files, output_files)))
+
+    def process(self, raw_files, output_files):
+        # Each image is saved as soon as it is read, so a failing line art file can't drop the beauty
+        images = []
+        try:
+            for raw_file, output_file in zip(raw_files, output_files):
+                images.append(read_tga(raw_file))
+                self.save(output_file, images[-1])
+        finally:
+            for raw_file in raw_files:
+                if os.path.exists(raw_file):
+                    os.remove(raw_file)
+
+        base_name = os.path.splitext(output_files[0])[0]
+        if self.composite_lineart and len(images) == 2:
+            composite = alpha_over(images[0], images[1])
+            self.save(f"{base_name}_composite.{self.extensions[self.file_format]}", composite)
+            images[0] = composite
+        if self.thumbnail_size:
+            self.save(f"{base_name}_thumb.{self.extensions[self.file_format]}", make_thumbnail(images[0], self.thumbnail_size))
+
+    def save(self, path, pixels):
+        if self.file_format == 'WEBP':
+            from PIL import Image
+            mode = "RGBA" if pixels.shape[2] == 4 else "RGB"
+            Image.fromarray(pixels, mode).save(path, "WEBP", quality=100 - self.compression)
+        else:
+            write_png(path, pixels, self.compression)
+
+    def finish(self):
+        """Wait for all queued images and collect the failures"""
+        for output_files, future in self.futures:
+            try:
+                future.result()
+            except Exception as error:
+                self.errors.append((output_files, error))
+        self.futures = []
+        self.executor.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return self.errors
+
+
+class LayerVisibility:
+    """Name index of the layer collections of a view layer with diff-based exclude changes"""
+
+    def __init__(self, view_layer):
+        self.view_layer = view_layer
+        self.layer_index = {}
+        self.layer_parents = {}
+        self.layer_descendants = {}
+        self.build_layer_index()
+        self.original_states = {
+            name: layer_collection.exclude for name, layer_collection in self.layer_index.items()
+        }
+        self.exclude_states = dict(self.original_states)
+
+    def __contains__(self, collection_name):
+        return collection_name in self.layer_index
+
+    def get(self, collection_name):
+        return self.layer_index.get(collection_name)
+
+    def restore(self):
+        """Restore original active states of all collections
+
+        Written top-down against the live flags, as writing a parent also changes its children.
+        """
+        for name, original_exclude in self.original_states.items():
+            layer_collection = self.layer_index[name]
+            if layer_collection.exclude != original_exclude:
+                layer_collection.exclude = original_exclude
+        self.exclude_states = {name: layer_collection.exclude for name, layer_collection in self.layer_index.items()}
+
+    def build_layer_index(self):
+        """Map collection names to their layer collections and parents in one walk of the hierarchy"""
+        root = self.view_layer.layer_collection
+        self.layer_index = {}
+        self.layer_parents = {}
+        self.layer_descendants = {}
+        # Top-down order, parents always come before their children
+        for layer_collection in self.get_all_layer_collections(root):
+            name = layer_collection.collection.name
+            self.layer_index[name] = layer_collection
+            self.layer_descendants[name] = []
+            for child in layer_collection.children:
+                self.layer_parents[child.collection.name] = name
+
+            parent = self.layer_parents.get(name)
+            while parent is not None:
+                self.layer_descendants[parent].append(name)
+                parent = self.layer_parents.get(parent)
+
+    def set_exclude(self, collection_name, exclude):
+        """Change the exclude flag only when it differs from the current state"""
+        if self.exclude_states.get(collection_name) != exclude:
+            self.layer_index[collection_name].exclude = exclude
+            self.exclude_states[collection_name] = exclude
+            # Blender applies the change to the children too, read their new states back
+            for name in self.layer_descendants[collection_name]:
+                self.exclude_states[name] = self.layer_index[name].exclude
+
+    def show_only(self, collection_names):
+        """Include the given collections and their parents, exclude everything around them"""
+        shown = [name for name in collection_names if name in self.layer_index]
+        active = set()
+        for name in shown:
+            while name is not None:
+                active.add(name)
+                name = self.layer_parents.get(name)
+
+        # Siblings along the path to each shown collection get excluded,
+        # the contents of the shown collections keep their own state
+        # Top-down, so writes to a parent don't undo those made to its children
+        containers = [self.view_layer.layer_collection]
+        containers.extend(layer for name, layer in self.layer_index.items() if name in active and name not in shown)
+        for container in containers:
+            for child in container.children:
+                child_name = child.collection.name
+                self.set_exclude(child_name, child_name not in active)
+
+    def get_all_layer_collections(self, parent_layer_collection):
+        """Recursively get all layer collections in the hierarchy"""
+        all_layer_collections = []
+        for layer_collection in parent_layer_collection.children:
+            all_layer_collections.append(layer_collection)
+            all_layer_collections.extend(self.get_all_layer_collections(layer_collection))
+        return all_layer_collections
+
+
+class CollectionRenderer:
+    """Render collections one by one, shared by the operator and background workers"""
+
+    ink_view_layer_name = "tech_ink_pass"
+
+    def __init__(self, scene, view_layer, output_path, render_lineart, report, cache=None, single_pass=False,
+                 cameras=None, camera_folders=False, profiler=None, file_format='PNG', compression=15,
+                 async_write=False, composite_lineart=False, thumbnail_size=0, preview=None):
+        self.scene = scene
+        self.view_layer = view_layer
+        self.output_path = output_path
+        self.render_lineart = render_lineart
+        self.report = report
+        self.cache = cache
+        self.profiler = profiler
+        self.file_format = file_format
+        self.compression = compression
+        self.extension = {'PNG': "png", 'WEBP': "webp", 'OPEN_EXR': "exr"}[file_format]
+        self.async_write = async_write and file_format in ImageWriter.extensions
+        self.composite_lineart = composite_lineart
+        self.thumbnail_size = thumbnail_size
+        self.writer = None
+        self.original_image_settings = None
+        self.preview = PreviewSettings(**preview) if preview else None
+        self.single_pass = single_pass and render_lineart
+        self.cameras = cameras or [scene.camera]
+        self.camera_folders = camera_folders
+        self.original_camera = scene.camera
+        self.visibility = None
+        self.ink_visibility = None
+        self.ink_view_layer = None
+        self.ink_holdout = None
+        self.pass_nodes = []
+        self.pass_dir = os.path.join(output_path, ".single_pass")
+        self.original_compositing = None
+        self.original_layer_use = {}
+        self.rendered = []
+        self.skipped = []
+        self.failed = []
+        self.matrix = {}
+        self.settings_fingerprint = None
+
+    def begin(self):
+        """Create the output folder and remember the current collection states"""
+        # Before the run changes image, preview and compositing settings
+        self.settings_fingerprint = render_settings_fingerprint(self.scene)
+
+        if not os.path.exists(self.output_path):
+            os.makedirs(self.output_path)
+
+        self.visibility = LayerVisibility(self.view_layer)
+
+        if self.async_write and self.file_format == 'WEBP':
+            try:
+                import PIL  # noqa: F401
+            except ImportError:
+                self.report({'WARNING'}, "Pillow is not available, WebP images are written by Blender instead.")
+                self.async_write = False
+
+        if self.async_write:
+            self.writer = ImageWriter(self.file_format, self.compression, self.composite_lineart, self.thumbnail_size)
+
+        image_settings = self.scene.render.image_settings
+        self.original_image_settings = {
+            key: getattr(image_settings, key)
+            for key in ("file_format", "color_mode", "color_depth", "compression", "quality", "exr_codec")
+        }
+        self.apply_image_settings(image_settings)
+
+        if self.preview is not None:
+            self.preview.apply(self.scene)
+
+        if self.profiler is not None:
+            self.profiler.start()
+
+        if self.single_pass:
+            if "tech_ink" in self.visibility:
+                self.setup_single_pass()
+            else:
+                self.report({'ERROR'}, "Line art collection 'tech_ink' not found!")
+                self.single_pass = False
+
+    def end(self):
+        """Restore original active states of all collections
+
+        Safe to call after begin() stopped partway, only what it changed is restored.
+        """
+        if self.visibility is not None:
+            self.visibility.restore()
+        self.scene.camera = self.original_camera
+
+        if self.ink_view_layer is not None:
+            self.teardown_single_pass()
+
+        if self.writer is not None:
+            for output_files, error in self.writer.finish():
+                self.report({'ERROR'}, f"Writing '{output_files[0]}' failed: {error}")
+                self.failed.append({"name": os.path.basename(output_files[0]), "error": str(error)})
+            self.writer = None
+
+        self.restore_image_settings()
+
+        if self.preview is not None:
+            self.preview.restore(self.scene)
+
+        if self.cache is not None:
+            self.cache.save()
+
+        if self.profiler is not None:
+            self.profiler.update_file_sizes()
+            self.profiler.stop()
+
+    def apply_image_settings(self, image_settings):
+        """Set the output format for the run, uncompressed Targa when the writer encodes the images"""
+        if self.writer is not None:
+            image_settings.file_format = 'TARGA_RAW'
+            image_settings.color_mode = 'RGBA'
+            return
+
+        image_settings.file_format = self.file_format
+        image_settings.color_mode = 'RGBA'
+        if self.file_format == 'PNG':
+            image_settings.compression = self.compression
+        elif self.file_format == 'WEBP':
+            image_settings.quality = 100 - self.compression
+        else:
+            image_settings.exr_codec = 'ZIP' if self.compression else 'NONE'
+
+    def restore_image_settings(self):
+        if self.original_image_settings is None:
+            return
+        image_settings = self.scene.render.image_settings
+        image_settings.file_format = self.original_image_settings["file_format"]
+        for key, value in self.original_image_settings.items():
+            try:
+                setattr(image_settings, key, value)
+            except TypeError:
+                pass  # Not available for the restored format
+        self.original_image_settings = None
+
+    def render_path(self, output_file):
+        """File Blender renders into, the final image or the writer's intermediate file"""
+        if self.writer is not None:
+            return self.writer.intermediate_path(output_file)
+        return output_file
+
+    def output_dir(self, camera_name):
+        """Folder for the images of one camera"""
+        if self.camera_folders:
+            return os.path.join(self.output_path, camera_name)
+        return self.output_path
+
+    def output_files(self, collection_name, camera_name):
+        """Image paths written for a collection"""
+        output_dir = self.output_dir(camera_name)
+        output_files = [os.path.join(output_dir, f"{collection_name}_{camera_name}.{self.extension}")]
+        if self.render_lineart:
+            output_files.append(os.path.join(output_dir, f"{collection_name}_{camera_name}_lineart.{self.extension}"))
+        return output_files
+
+    def relative_output_files(self, collection_name, camera):
+        """Image paths of a collection and camera relative to the output folder, for the render matrix"""
+        output_files = self.output_files(collection_name, self.get_camera_name(camera))
+        return [os.path.relpath(path, self.output_path) for path in output_files]
+
+    def cache_entries(self, collection_name):
+        """Cache key and current fingerprint of a collection for every camera"""
+        if self.settings_fingerprint is None:
+            self.settings_fingerprint = render_settings_fingerprint(self.scene)
+        entries = []
+        for camera in self.cameras:
+            camera_name = self.get_camera_name(camera)
+            fingerprint = collection_fingerprint(
+                self.scene, collection_name, self.render_lineart, camera, self.settings_fingerprint
+            )
+            entries.append((camera, f"{collection_name}_{camera_name}", fingerprint))
+        return entries
+
+    def is_cached(self, collection_name, camera, cache_key, fingerprint):
+        """Check if the collection is unchanged since its last render from this camera"""
+        camera_name = self.get_camera_name(camera)
+        return self.cache.is_current(cache_key, fingerprint, self.output_files(collection_name, camera_name))
+
+    def render(self, collection_name):
+        """Render a single collection from every camera, and its line art if enabled"""
+        steps = self.render_steps(collection_name)
+        error = None
+        while True:
+            try:
+                write_still = next(steps) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+
+            error = None
+            try:
+                bpy.ops.render.render(write_still=write_still, scene=self.scene.name)
+            except RuntimeError as render_error:
+                error = render_error
+
+    def render_steps(self, collection_name):
+        """Prepare the scene for each render call of a collection
+
+        Yields the write_still value for every render call the caller has to make,
+        errors of a render call are thrown back in. Returns True when all cameras rendered.
+        """
+        if collection_name not in self.visibility:
+            self.report({'WARNING'}, f"Collection '{collection_name}' not found in the view layer.")
+            self.failed.append({"name": collection_name, "error": "not found in the view layer"})
+            return False
+
+        # Skip cameras whose fingerprint did not change since the last render
+        row = self.matrix.setdefault(collection_name, {})
+        if self.cache is not None:
+            pending = []
+            for entry in self.cache_entries(collection_name):
+                if self.is_cached(collection_name, *entry):
+                    row[self.get_camera_name(entry[0])] = self.relative_output_files(collection_name, entry[0])
+                else:
+                    pending.append(entry)
+        else:
+            pending = [(camera, None, None) for camera in self.cameras]
+
+        if not pending:
+            self.report({'INFO'}, f"Collection '{collection_name}' is unchanged, skipping.")
+            self.skipped.append(collection_name)
+            return True
+
+        # Activate only the target collection, lights_all, and its counterpart if it exists,
+        # once for all cameras
+        toggle_start = time.perf_counter()
+        self.visibility.show_only([collection_name, "lights_all", f"c_{collection_name}"])
+        toggle_time = time.perf_counter() - toggle_start
+
+        success = True
+        for camera, cache_key, fingerprint in pending:
+            camera_name = self.get_camera_name(camera)
+            toggle_start = time.perf_counter()
+            if camera is not None:
+                self.scene.camera = camera
+            toggle_time += time.perf_counter() - toggle_start
+            os.makedirs(self.output_dir(camera_name), exist_ok=True)
+
+            try:
+                if self.single_pass:
+                    yield from self.render_single_pass(collection_name, camera_name, toggle_time)
+                else:
+                    # Set the render filepath and render the collection
+                    output_file = self.output_files(collection_name, camera_name)[0]
+                    self.scene.render.filepath = self.render_path(output_file)  # Update the render file path
+                    render_time = yield from self.timed_render(True)  # Render the collection
+                    self.record_pass(collection_name, camera_name, "beauty", toggle_time, render_time, [output_file])
+
+                    # Render line art if enabled
+                    rendered_files = self.output_files(collection_name, camera_name)[:1]
+                    if self.render_lineart and (yield from self.render_line_art(collection_name, camera_name)):
+                        rendered_files = self.output_files(collection_name, camera_name)
+
+                    if self.writer is not None:
+                        self.writer.submit(rendered_files)
+            except (RuntimeError, OSError) as error:
+                self.report({'ERROR'}, f"Rendering '{collection_name}' from '{camera_name}' failed: {error}")
+                self.failed.append({"name": collection_name, "camera": camera_name, "error": str(error)})
+                row[camera_name] = None
+                success = False
+                continue
+            finally:
+                toggle_time = 0.0
+
+            if fingerprint is not None:
+                self.cache.update(cache_key, fingerprint)
+            row[camera_name] = self.relative_output_files(collection_name, camera)
+
+        if success:
+            self.rendered.append(collection_name)
+        return success
+
+    def timed_render(self, write_still):
+        """Yield a single render call and return how long it took"""
+        start = time.perf_counter()
+        yield write_still
+        return time.perf_counter() - start
+
+    def record_pass(self, collection_name, camera_name, pass_name, toggle_time, render_time, output_files):
+        if self.profiler is not None:
+            self.profiler.record(collection_name, camera_name, pass_name, toggle_time, render_time, output_files)
+
+    def get_camera_name(self, camera=None):
+        """Get the camera name (without the first part before "_")"""
+        active_camera = camera or self.scene.camera
+        if active_camera:
+            return active_camera.name.split("_", 1)[-1]
+        return "NoCamera"
+
+    def update_line_art_source(self, collection_name):
+        """Point the Line Art modifier at the rendered collection"""
+        line_art_object = bpy.data.objects.get("LineArt")
+        if line_art_object and line_art_object.type == 'GPENCIL':
+            line_art_modifier = line_art_object.grease_pencil_modifiers.get("Line Art")
+            if line_art_modifier:
+                line_art_modifier.source_collection = bpy.data.collections.get(collection_name)
+
+    def render_line_art(self, collection_name, camera_name):
+        """Render the line art for a specific collection, returns False when there is no line art setup"""
+        tech_ink_layer = self.visibility.get("tech_ink")
+        target_layer = self.visibility.get(collection_name)
+        
+        if not tech_ink_layer:
+            self.report({'ERROR'}, "Line art collection 'tech_ink' not found!")
+            return False
+        
+        # Set target collection as holdout and activate tech_ink
+        toggle_start = time.perf_counter()
+        original_holdout = target_layer.holdout
+        original_tech_ink_exclude = self.visibility.exclude_states["tech_ink"]
+        target_layer.holdout = True
+        self.visibility.set_exclude("tech_ink", False)
+        
+        # Update the Line Art modifier
+        self.update_line_art_source(collection_name)
+        toggle_time = time.perf_counter() - toggle_start
+        
+        try:
+            # Set the render filepath and render the line art
+            output_file = self.output_files(collection_name, camera_name)[1]
+            self.scene.render.filepath = self.render_path(output_file)  # Update the render file path
+            render_time = yield from self.timed_render(True)  # Render the line art
+            self.record_pass(collection_name, camera_name, "lineart", toggle_time, render_time, [output_file])
+        finally:
+            # Restore settings
+            target_layer.holdout = original_holdout
+            self.visibility.set_exclude("tech_ink", original_tech_ink_exclude)
+        return True
+
+    def setup_single_pass(self):
+        """Add a line art view layer and File Output nodes writing both images in one render"""
+        scene = self.scene
+        os.makedirs(self.pass_dir, exist_ok=True)
+
+        # The line art view layer sees the target as holdout with tech_ink on top
+        self.ink_view_layer = scene.view_layers.new(self.ink_view_layer_name)
+        self.ink_visibility = LayerVisibility(self.ink_view_layer)
+
+        self.original_compositing = (scene.use_nodes, scene.render.use_compositing)
+        had_nodes = scene.use_nodes
+        scene.use_nodes = True
+        scene.render.use_compositing = True
+        tree = scene.node_tree
+
+        # Keep an existing compositor result as the beauty image
+        beauty_socket = None
+        if had_nodes:
+            for node in tree.nodes:
+                if node.type == 'COMPOSITE' and node.inputs["Image"].is_linked:
+                    beauty_socket = node.inputs["Image"].links[0].from_socket
+                    break
+
+        # Nodes are remembered as they are added, so a failed setup can still be torn down
+        beauty_layers = tree.nodes.new("CompositorNodeRLayers")
+        self.pass_nodes.append(beauty_layers)
+        beauty_layers.layer = self.view_layer.name
+        ink_layers = tree.nodes.new("CompositorNodeRLayers")
+        self.pass_nodes.append(ink_layers)
+        ink_layers.layer = self.ink_view_layer.name
+
+        file_output = tree.nodes.new("CompositorNodeOutputFile")
+        self.pass_nodes.append(file_output)
+        file_output.base_path = self.pass_dir
+        self.apply_image_settings(file_output.format)
+        file_output.file_slots.clear()
+        file_output.file_slots.new("beauty_####")
+        file_output.file_slots.new("lineart_####")
+
+        tree.links.new(beauty_socket or beauty_layers.outputs["Image"], file_output.inputs[0])
+        tree.links.new(ink_layers.outputs["Image"], file_output.inputs[1])
+
+        # Only render the two layers (and those the existing compositor reads), not every used layer
+        needed = {self.view_layer.name, self.ink_view_layer.name}
+        if beauty_socket is not None:
+            needed.update(node.layer for node in tree.nodes if node.type == 'R_LAYERS')
+        self.original_layer_use = {layer.name: layer.use for layer in scene.view_layers}
+        for layer in scene.view_layers:
+            layer.use = layer.name in needed
+
+    def teardown_single_pass(self):
+        """Remove the line art view layer and File Output nodes"""
+        scene = self.scene
+        for node in self.pass_nodes:
+            scene.node_tree.nodes.remove(node)
+        self.pass_nodes = []
+
+        if self.original_compositing is not None:
+            scene.use_nodes, scene.render.use_compositing = self.original_compositing
+            self.original_compositing = None
+        scene.view_layers.remove(self.ink_view_layer)
+        for layer in scene.view_layers:
+            if layer.name in self.original_layer_use:
+                layer.use = self.original_layer_use[layer.name]
+        self.original_layer_use = {}
+        self.ink_view_layer = None
+        self.ink_visibility = None
+        self.ink_holdout = None
+
+        if os.path.isdir(self.pass_dir) and not os.listdir(self.pass_dir):
+            os.rmdir(self.pass_dir)
+
+    def render_single_pass(self, collection_name, camera_name, toggle_time):
+        """Render beauty and line art of a collection with a single render call"""
+        toggle_start = time.perf_counter()
+        ink_visibility = self.ink_visibility
+        ink_visibility.show_only([collection_name, "lights_all", f"c_{collection_name}", "tech_ink"])
+
+        # Only the current target is held out in the line art view layer
+        if self.ink_holdout is not None:
+            ink_visibility.get(self.ink_holdout).holdout = False
+        ink_visibility.get(collection_name).holdout = True
+        self.ink_holdout = collection_name
+
+        self.update_line_art_source(collection_name)
+        toggle_time += time.perf_counter() - toggle_start
+        render_time = yield from self.timed_render(False)
+
+        # File Output nodes always add the frame number, move the images to their final names
+        frame = self.scene.frame_current
+        extension = "tga" if self.writer is not None else self.extension
+        beauty_file, lineart_file = self.output_files(collection_name, camera_name)
+        os.replace(os.path.join(self.pass_dir, f"beauty_{frame:04d}.{extension}"), self.render_path(beauty_file))
+        os.replace(os.path.join(self.pass_dir, f"lineart_{frame:04d}.{extension}"), self.render_path(lineart_file))
+        if self.writer is not None:
+            self.writer.submit([beauty_file, lineart_file])
+        self.record_pass(
+            collection_name, camera_name, "combined", toggle_time, render_time, [beauty_file, lineart_file]
+        )
+
+
 class RENDER_OT_collections_with_lineart(bpy.types.Operator):
     """Render selected collections with optional line art"""
     bl_idname = "render.render_collections_with_lineart"
@@ -59,131 +1388,645 @@ class RENDER_OT_collections_with_lineart(bpy.types.Operator):
         self.render_lineart = context.scene.render_collections_lineart
         
         # Convert to an absolute path
-        output_path = bpy.path.abspath(context.scene.render_collections_output_path)
-        
-        # Ensure the directory exists
-        if not os.path.exists(output_path):
-            os.makedirs(output_path)
+        output_path = scene_output_path(context.scene)
         
         scene = context.scene
         view_layer = context.view_layer
         
-        # Save original active states of collections
-        original_states = {
-            layer_collection: layer_collection.exclude
-            for layer_collection in self.get_all_layer_collections(view_layer.layer_collection)
-        }
-        rendered_count = 0  # Counter for rendered collections
-        
         # Get user-defined collections list
         collections_to_render = [item.name for item in scene.render_collections_list]
         total_collections = len(collections_to_render)
+
+        cameras = find_cameras(scene, scene.render_collections_camera_pattern)
+        if not cameras:
+            self.report({'ERROR'}, f"No cameras match '{scene.render_collections_camera_pattern}'.")
+            return {'CANCELLED'}
+
+        if scene.render_collections_farm_mode:
+            return self.execute_farm(context, output_path, collections_to_render, cameras)
         
+        cache = RenderCache(output_path) if scene.render_collections_use_cache else None
+        profiler = RenderProfiler() if scene.render_collections_profile else None
+        renderer = CollectionRenderer(
+            scene, view_layer, output_path, self.render_lineart, self.report, cache,
+            cameras=cameras,
+            profiler=profiler,
+            **scene_render_options(scene)
+        )
         # Progress bar setup
         progress = 0
+        context.window_manager.progress_begin(0, total_collections)
         try:
+            renderer.begin()
             for collection_name in collections_to_render:
                 progress += 1
                 progress_message = f"Rendering {progress}/{total_collections}: {collection_name}"
                 self.report({'INFO'}, progress_message)
                 print(progress_message)
-                bpy.context.window_manager.progress_update(progress / total_collections)
-                
-                # Deactivate all collections
-                for layer_collection in view_layer.layer_collection.children:
-                    layer_collection.exclude = True
-                
-                # Activate the target collection, lights_all, and its counterpart if it exists
-                target_layer = self.get_layer_collection(view_layer.layer_collection, collection_name)
-                lights_layer = self.get_layer_collection(view_layer.layer_collection, "lights_all")
-                counterpart_layer = self.get_layer_collection(view_layer.layer_collection, f"c_{collection_name}")
-                
-                if target_layer:
-                    target_layer.exclude = False
-                    if lights_layer:
-                        lights_layer.exclude = False
-                    if counterpart_layer:
-                        counterpart_layer.exclude = False
-                    
-                    # Get the active camera name (without the first part before "_")
-                    active_camera = bpy.context.scene.camera
-                    if active_camera:
-                        camera_name = active_camera.name.split("_", 1)[-1]
-                    else:
-                        camera_name = "NoCamera"
-                    
-                    # Set the render filepath and render the collection
-                    output_file = os.path.join(output_path, f"{collection_name}_{camera_name}.png")
-                    scene.render.filepath = output_file  # Update the render file path
-                    bpy.ops.render.render(write_still=True)  # Render the collection
-                    rendered_count += 1
-                    
-                    # Render line art if enabled
-                    if self.render_lineart:
-                        self.render_line_art(view_layer, collection_name, output_path, camera_name)
-                else:
-                    self.report({'WARNING'}, f"Collection '{collection_name}' not found in the view layer.")
+                context.window_manager.progress_update(progress)
+                renderer.render(collection_name)
         
         finally:
-            # Restore original active states of all collections
-            for layer_collection, original_exclude in original_states.items():
-                layer_collection.exclude = original_exclude
+            renderer.end()
+            write_render_matrix(output_path, renderer.matrix)
+            if renderer.preview is not None and renderer.preview.contact_sheet:
+                write_contact_sheet(output_path, renderer.matrix)
+            if profiler is not None:
+                profiler.write(output_path)
 
             # Finalize progress bar
-            bpy.context.window_manager.progress_end()
-            self.report({'INFO'}, f"Rendered {rendered_count} collections. Saved to: {output_path}")
-            print(f"Rendered {rendered_count} collections. Images saved to: {output_path}")
+            context.window_manager.progress_end()
+            rendered_count = len(renderer.rendered)
+            skipped_count = len(renderer.skipped)
+            self.report({'INFO'}, f"Rendered {rendered_count} collections, {skipped_count} unchanged. Saved to: {output_path}")
+            print(f"Rendered {rendered_count} collections, {skipped_count} unchanged. Images saved to: {output_path}")
         
         return {'FINISHED'}
-    
-    def render_line_art(self, view_layer, collection_name, output_path, camera_name):
-        """Render the line art for a specific collection"""
-        tech_ink_layer = self.get_layer_collection(view_layer.layer_collection, "tech_ink")
-        target_layer = self.get_layer_collection(view_layer.layer_collection, collection_name)
-        
-        if not tech_ink_layer:
-            self.report({'ERROR'}, "Line art collection 'tech_ink' not found!")
-            return
-        
-        # Set target collection as holdout and activate tech_ink
-        target_layer.holdout = True
-        tech_ink_layer.exclude = False
-        
-        # Update the Line Art modifier
-        line_art_object = bpy.data.objects.get("LineArt")
-        if line_art_object and line_art_object.type == 'GPENCIL':
-            line_art_modifier = line_art_object.grease_pencil_modifiers.get("Line Art")
-            if line_art_modifier:
-                line_art_modifier.source_collection = bpy.data.collections.get(collection_name)
-        
-        # Set the render filepath and render the line art
-        output_file = os.path.join(output_path, f"{collection_name}_{camera_name}_lineart.png")
-        bpy.context.scene.render.filepath = output_file  # Update the render file path
-        bpy.ops.render.render(write_still=True)  # Render the line art
-        
-        # Restore settings
-        target_layer.holdout = False
-        tech_ink_layer.exclude = True
 
-    def get_layer_collection(self, parent_layer_collection, collection_name):
-        """Recursively search for the layer collection corresponding to a given collection name"""
-        for layer_collection in parent_layer_collection.children:
-            if layer_collection.collection.name == collection_name:
-                return layer_collection
-        return None
+    def execute_farm(self, context, output_path, collections_to_render, cameras):
+        """Split the collections between background Blender workers and wait for them"""
+        if not collections_to_render:
+            self.report({'WARNING'}, "No collections to render.")
+            return {'CANCELLED'}
 
-    def get_all_layer_collections(self, parent_layer_collection):
-        """Recursively get all layer collections in the hierarchy"""
-        all_layer_collections = []
-        for layer_collection in parent_layer_collection.children:
-            all_layer_collections.append(layer_collection)
-            all_layer_collections.extend(self.get_all_layer_collections(layer_collection))
-        return all_layer_collections
+        scene = context.scene
+
+        # Leave out unchanged collections before splitting the work
+        cache = None
+        fingerprints = {}
+        if scene.render_collections_use_cache:
+            cache = RenderCache(output_path)
+            planner = CollectionRenderer(
+                scene, context.view_layer, output_path, self.render_lineart, self.report, cache,
+                cameras=cameras, **scene_render_options(scene)
+            )
+            for collection_name in collections_to_render:
+                fingerprints[collection_name] = planner.cache_entries(collection_name)
+            collections_to_render = [
+                collection_name for collection_name in collections_to_render
+                if not all(planner.is_cached(collection_name, *entry) for entry in fingerprints[collection_name])
+            ]
+            skipped_count = len(fingerprints) - len(collections_to_render)
+            if skipped_count:
+                self.report({'INFO'}, f"Skipping {skipped_count} unchanged collection(s).")
+            if not collections_to_render:
+                self.report({'INFO'}, "All collections are unchanged. Nothing to render.")
+                return {'FINISHED'}
+
+        worker_count = max(1, min(scene.render_collections_workers, len(collections_to_render)))
+        threads_per_worker = max(1, (os.cpu_count() or 1) // worker_count)
+
+        # Workers read the scene from disk, so save a copy of the current state
+        farm_dir = tempfile.mkdtemp(prefix="render_collections_")
+        blend_path = os.path.join(farm_dir, "farm_scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        workers = []
+        for worker_index in range(worker_count):
+            job = {
+                "scene": scene.name,
+                "view_layer": context.view_layer.name,
+                "collections": collections_to_render[worker_index::worker_count],
+                "output_path": output_path,
+                "render_lineart": self.render_lineart,
+                "cameras": [camera.name for camera in cameras if camera is not None],
+                "profile": scene.render_collections_profile,
+                "options": scene_render_options(scene),
+                "result_path": os.path.join(farm_dir, f"result_{worker_index}.json"),
+            }
+            job_path = os.path.join(farm_dir, f"job_{worker_index}.json")
+            with open(job_path, "w") as job_file:
+                json.dump(job, job_file)
+
+            log_path = os.path.join(farm_dir, f"worker_{worker_index}.log")
+            command = [
+                bpy.app.binary_path, "-b", blend_path,
+                "-t", str(threads_per_worker),
+                "--python", os.path.abspath(__file__),
+                "--", "--worker", job_path,
+            ]
+            log_file = open(log_path, "w")
+            process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+            workers.append((process, job, log_file, log_path))
+
+        self.report({'INFO'}, f"Started {worker_count} render worker(s) for {len(collections_to_render)} collections.")
+        print(f"Started {worker_count} render worker(s). Logs in: {farm_dir}")
+
+        rendered = []
+        failed = []
+        matrix = {}
+        profiler = RenderProfiler() if scene.render_collections_profile else None
+        succeeded_logs = set()
+        try:
+            for process, job, log_file, log_path in workers:
+                return_code = process.wait()
+                log_file.close()
+
+                # A missing or unreadable result file means the worker stopped early
+                result = None
+                try:
+                    with open(job["result_path"]) as result_file:
+                        result = json.load(result_file)
+                except (OSError, ValueError):
+                    pass
+
+                if result is None:
+                    error = f"worker exited with code {return_code}, see {log_path}"
+                    failed.extend({"name": name, "error": error} for name in job["collections"])
+                    continue
+
+                if not result["failed"]:
+                    succeeded_logs.add(log_path)
+                rendered.extend(result["rendered"])
+                failed.extend(result["failed"])
+                matrix.update(result["matrix"])
+                if profiler is not None:
+                    profiler.entries.extend(result.get("profile", []))
+        finally:
+            # Only the logs of failed workers are kept, the scene copy and job files go
+            for process, job, log_file, log_path in workers:
+                log_file.close()
+            kept_logs = {log_path for process, job, log_file, log_path in workers} - succeeded_logs
+            for file_name in os.listdir(farm_dir):
+                path = os.path.join(farm_dir, file_name)
+                if path not in kept_logs:
+                    os.remove(path)
+            if not kept_logs:
+                os.rmdir(farm_dir)
+
+        if cache is not None:
+            for collection_name in rendered:
+                for camera, cache_key, fingerprint in fingerprints[collection_name]:
+                    cache.update(cache_key, fingerprint)
+            cache.save()
+        write_render_matrix(output_path, matrix)
+        if scene.render_collections_tier == 'PREVIEW' and scene.render_collections_contact_sheet:
+            write_contact_sheet(output_path, matrix)
+        if profiler is not None:
+            profiler.write(output_path)
+
+        for failure in failed:
+            self.report({'WARNING'}, f"Collection '{failure['name']}' failed: {failure['error']}")
+
+        self.report({'INFO'}, f"Rendered {len(rendered)} collections, {len(failed)} failed. Saved to: {output_path}")
+        print(f"Rendered {len(rendered)} collections, {len(failed)} failed. Images saved to: {output_path}")
+        return {'FINISHED'}
+
+
+def print_report(level, message):
+    """Operator.report stand-in for the command line"""
+    print(f"{next(iter(level))}: {message}")
+
+
+def run_manifest_job(job):
+    """Render one job of a manifest in the currently open file and return its result"""
+    scene = bpy.data.scenes[job["scene"]] if "scene" in job else bpy.context.scene
+    if "view_layer" in job:
+        view_layer = scene.view_layers[job["view_layer"]]
+    elif scene == bpy.context.scene:
+        view_layer = bpy.context.view_layer
+    else:
+        view_layer = scene.view_layers[0]
+
+    tier = job.get("tier", scene.render_collections_tier).upper()
+    output_path = scene_output_path(scene, job.get("output_path"), tier)
+    render_lineart = job.get("lineart", scene.render_collections_lineart)
+
+    # Collections from the job, the scene's render list, or the scene's filter rules
+    collections_to_render = job.get("collections") or [item.name for item in scene.render_collections_list]
+    if not collections_to_render:
+        collection_filter = CollectionFilter.from_scene(scene)
+        collections_to_render = [
+            collection.name for collection in bpy.data.collections if collection_filter.matches(collection)
+        ]
+
+    cameras = job.get("cameras", scene.render_collections_camera_pattern)
+    if isinstance(cameras, list):
+        cameras = [bpy.data.objects[name] for name in cameras]
+    else:
+        cameras = find_cameras(scene, cameras)
+    if not cameras:
+        raise ValueError(f"No cameras match '{job.get('cameras')}'")
+
+    options = scene_render_options(scene, tier)
+    job_options = job.get("options", {})
+    # Keyword settings of the renderer, the rest come from the job itself
+    known_options = set(inspect.signature(CollectionRenderer).parameters) - {
+        "scene", "view_layer", "output_path", "render_lineart", "report", "cache", "cameras", "profiler",
+    }
+    unknown_options = sorted(set(job_options) - known_options)
+    if unknown_options:
+        raise ValueError(f"Unknown option(s): {', '.join(unknown_options)}")
+    options.update(job_options)
+    cache = RenderCache(output_path) if job.get("use_cache", scene.render_collections_use_cache) else None
+    profiler = RenderProfiler() if job.get("profile", scene.render_collections_profile) else None
+
+    renderer = CollectionRenderer(
+        scene, view_layer, output_path, render_lineart, print_report, cache,
+        cameras=cameras,
+        profiler=profiler,
+        **options
+    )
+    total_collections = len(collections_to_render)
+    try:
+        renderer.begin()
+        for progress, collection_name in enumerate(collections_to_render, start=1):
+            print(f"Rendering {progress}/{total_collections}: {collection_name}")
+            renderer.render(collection_name)
+    finally:
+        renderer.end()
+        write_render_matrix(output_path, renderer.matrix)
+        if renderer.preview is not None and renderer.preview.contact_sheet:
+            write_contact_sheet(output_path, renderer.matrix)
+        if profiler is not None:
+            profiler.write(output_path)
+
+    return {
+        "scene": scene.name,
+        "output_path": output_path,
+        "rendered": renderer.rendered,
+        "skipped": renderer.skipped,
+        "failed": renderer.failed,
+    }
+
+
+def run_manifest(manifest_path):
+    """Run the render jobs of a manifest, opening each .blend file only once
+
+    Writes a result file next to the manifest and returns the process exit code,
+    1 when any job failed.
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
 
+    default_result = os.path.splitext(os.path.basename(manifest_path))[0] + "_result.json"
+    result_path = os.path.join(manifest_dir, manifest.get("result", default_result))
+
+    # Group the jobs by file, keeping the manifest order within each file
+    jobs_by_file = {}
+    for job_index, job in enumerate(manifest["jobs"]):
+        blend_path = os.path.join(manifest_dir, job["blend"]) if job.get("blend") else bpy.data.filepath
+        jobs_by_file.setdefault(os.path.abspath(blend_path), []).append((job_index, job))
+
+    results = []
+    for blend_path, jobs in jobs_by_file.items():
+        if blend_path != os.path.abspath(bpy.data.filepath):
+            print(f"Opening {blend_path}")
+            try:
+                bpy.ops.wm.open_mainfile(filepath=blend_path)
+            except RuntimeError as error:
+                for job_index, job in jobs:
+                    results.append({"job": job_index, "blend": blend_path, "error": f"could not open file: {error}"})
+                continue
+
+        for job_index, job in jobs:
+            # Any failure is recorded for its job, the remaining jobs still run
+            try:
+                result = run_manifest_job(job)
+            except Exception as error:
+                result = {"error": f"{type(error).__name__}: {error}"}
+            result.update({"job": job_index, "blend": blend_path})
+            results.append(result)
+
+    results.sort(key=lambda result: result["job"])
+    success = not any(result.get("error") or result.get("failed") for result in results)
+    with open(result_path, "w") as result_file:
+        json.dump({"success": success, "jobs": results}, result_file, indent=1)
+
+    print(f"{'Finished' if success else 'Failed'}: {len(results)} job(s). Result saved to: {result_path}")
+    return 0 if success else 1
+
+
+def run_worker(job_path):
+    """Render the collections listed in a job file, used by the background workers"""
+    with open(job_path) as job_file:
+        job = json.load(job_file)
+
+    scene = bpy.data.scenes[job["scene"]]
+    view_layer = scene.view_layers[job["view_layer"]]
+
+    cameras = [bpy.data.objects[name] for name in job.get("cameras", [])]
+    renderer = CollectionRenderer(
+        scene, view_layer, job["output_path"], job["render_lineart"], print_report,
+        cameras=cameras,
+        profiler=RenderProfiler() if job.get("profile") else None,
+        **job.get("options", {})
+    )
+    total_collections = len(job["collections"])
+    try:
+        renderer.begin()
+        for progress, collection_name in enumerate(job["collections"], start=1):
+            print(f"Rendering {progress}/{total_collections}: {collection_name}")
+            renderer.render(collection_name)
+    except Exception as error:
+        # Collections the worker did not get to are reported as failed, not silently left out
+        done = set(renderer.rendered) | set(renderer.skipped) | {entry["name"] for entry in renderer.failed}
+        renderer.failed.extend(
+            {"name": name, "error": f"{type(error).__name__}: {error}"}
+            for name in job["collections"] if name not in done
+        )
+        raise
+    finally:
+        renderer.end()
+
+        with open(job["result_path"], "w") as result_file:
+            json.dump({
+                "rendered": renderer.rendered,
+                "failed": renderer.failed,
+                "matrix": renderer.matrix,
+                "profile": renderer.profiler.entries if renderer.profiler else [],
+            }, result_file)
+
+
+def save_queue_state(scene, output_path):
+    """Write the status of every listed collection next to the renders, to resume after a crash"""
+    state = {
+        item.name: {"status": item.status, "render_time": item.render_time}
+        for item in scene.render_collections_list
+    }
+    os.makedirs(output_path, exist_ok=True)
+    with open(os.path.join(output_path, ".render_queue.json"), "w") as queue_file:
+        json.dump(state, queue_file, indent=1)
+
+def load_queue_state(scene, output_path):
+    """Restore the status of the listed collections saved by save_queue_state"""
+    queue_path = os.path.join(output_path, ".render_queue.json")
+    if not os.path.exists(queue_path):
+        return
+    try:
+        with open(queue_path) as queue_file:
+            state = json.load(queue_file)
+    except (OSError, ValueError):
+        return
+
+    for item in scene.render_collections_list:
+        entry = state.get(item.name)
+        if entry is None:
+            continue
+        # A collection that was rendering when Blender stopped starts over
+        item.status = 'PENDING' if entry["status"] == 'RENDERING' else entry["status"]
+        item.render_time = entry["render_time"]
+
+
+class RENDER_OT_collections_queue(bpy.types.Operator):
+    """Render listed collections without blocking the interface. Press Esc to cancel"""
+    bl_idname = "render.render_collections_queue"
+    bl_label = "Start Render Queue"
+
+    resume: bpy.props.BoolProperty(
+        name="Resume",
+        description="Only render the collections that did not finish in the previous run",
+        default=False
+    )
+
+    # Shown in the panel while the queue runs
+    is_running = False
+    status_text = ""
+
+    def invoke(self, context, event):
+        if RENDER_OT_collections_queue.is_running:
+            self.report({'WARNING'}, "The render queue is already running.")
+            return {'CANCELLED'}
+
+        scene = context.scene
+        output_path = scene_output_path(scene)
+
+        cameras = find_cameras(scene, scene.render_collections_camera_pattern)
+        if not cameras:
+            self.report({'ERROR'}, f"No cameras match '{scene.render_collections_camera_pattern}'.")
+            return {'CANCELLED'}
+
+        if self.resume:
+            load_queue_state(scene, output_path)
+        else:
+            for item in scene.render_collections_list:
+                item.status = 'PENDING'
+                item.render_time = 0.0
+
+        self.queue = [item.name for item in scene.render_collections_list if item.status not in {'DONE', 'SKIPPED'}]
+        if not self.queue:
+            self.report({'INFO'}, "Nothing left to render.")
+            return {'FINISHED'}
+
+        cache = RenderCache(output_path) if scene.render_collections_use_cache else None
+        self.renderer = CollectionRenderer(
+            scene, context.view_layer, output_path, scene.render_collections_lineart, self.report, cache,
+            cameras=cameras,
+            profiler=RenderProfiler() if scene.render_collections_profile else None,
+            **scene_render_options(scene)
+        )
+        try:
+            self.renderer.begin()
+        except Exception:
+            self.renderer.end()
+            raise
+
+        self.output_path = output_path
+        self.total = len(self.queue)
+        self.finished_count = 0
+        self.total_time = 0.0
+        self.current = None
+        self.item_start = 0.0
+        self.steps = None
+        self.pending_write_still = None
+        self.rendering = False
+        self.render_event = None
+        self.cancelled = False
+
+        # Render jobs report back through the handlers, the timer polls their result
+        bpy.app.handlers.render_complete.append(self.on_render_complete)
+        bpy.app.handlers.render_cancel.append(self.on_render_cancel)
+
+        window_manager = context.window_manager
+        self.timer = window_manager.event_timer_add(0.5, window=context.window)
+        window_manager.modal_handler_add(self)
+        window_manager.progress_begin(0, self.total)
+
+        RENDER_OT_collections_queue.is_running = True
+        RENDER_OT_collections_queue.status_text = f"0/{self.total}"
+        return {'RUNNING_MODAL'}
+
+    def on_render_complete(self, scene, *args):
+        self.render_event = 'COMPLETE'
+
+    def on_render_cancel(self, scene, *args):
+        self.render_event = 'CANCEL'
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.cancelled = True
+            self.report({'WARNING'}, "Render queue cancelled.")
+            if not self.rendering:
+                return self.finish(context)
+            return {'RUNNING_MODAL'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        if self.rendering:
+            if self.render_event is None:
+                return {'PASS_THROUGH'}
+
+            render_event = self.render_event
+            self.render_event = None
+            self.rendering = False
+            if render_event == 'CANCEL':
+                self.cancelled = True
+
+        # The handlers fire from the render thread before the render job has ended,
+        # a new render can only start once it is gone
+        if bpy.app.is_job_running('RENDER'):
+            return {'PASS_THROUGH'}
+
+        if self.cancelled:
+            return self.finish(context)
+        return self.advance(context)
+
+    def advance(self, context, error=None):
+        """Prepare the scene for the next render call and start it as a render job"""
+        while True:
+            if self.steps is None:
+                if not self.queue:
+                    return self.finish(context)
+                self.start_item(self.queue.pop(0))
+                error = None
+
+            if self.pending_write_still is not None:
+                write_still = self.pending_write_still
+                self.pending_write_still = None
+            else:
+                try:
+                    write_still = next(self.steps) if error is None else self.steps.throw(error)
+                except StopIteration as stop:
+                    self.finish_item(context, stop.value)
+                    continue
+
+            result = bpy.ops.render.render('INVOKE_DEFAULT', write_still=write_still, scene=self.renderer.scene.name)
+            if 'RUNNING_MODAL' in result:
+                self.rendering = True
+                return {'PASS_THROUGH'}
+            if bpy.app.is_job_running('RENDER'):
+                # Refused because another render job is still running, retried on the next tick
+                self.pending_write_still = write_still
+                return {'PASS_THROUGH'}
+            error = RuntimeError("the render job could not be started")
+
+    def start_item(self, collection_name):
+        self.current = collection_name
+        self.item_start = time.perf_counter()
+        self.steps = self.renderer.render_steps(collection_name)
+        self.set_item(collection_name, 'RENDERING')
+
+    def finish_item(self, context, success):
+        """Record status and timing of the current collection and update the ETA"""
+        elapsed = time.perf_counter() - self.item_start
+        if self.current in self.renderer.skipped:
+            status = 'SKIPPED'
+        else:
+            status = 'DONE' if success else 'FAILED'
+        self.set_item(self.current, status, elapsed)
+        save_queue_state(context.scene, self.output_path)
+
+        self.finished_count += 1
+        self.total_time += elapsed
+        remaining = self.total_time / self.finished_count * len(self.queue)
+        eta = time.strftime("%H:%M:%S", time.gmtime(remaining))
+        RENDER_OT_collections_queue.status_text = (
+            f"{self.finished_count}/{self.total}, last: {self.current} ({elapsed:.1f}s), ETA {eta}"
+        )
+        print(f"Rendered {self.finished_count}/{self.total}: {self.current} in {elapsed:.1f}s")
+
+        context.window_manager.progress_update(self.finished_count)
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+        self.current = None
+        self.steps = None
+
+    def set_item(self, collection_name, status, render_time=None):
+        for item in bpy.context.scene.render_collections_list:
+            if item.name == collection_name:
+                item.status = status
+                if render_time is not None:
+                    item.render_time = render_time
+
+    def finish(self, context):
+        """Stop the queue, restore the scene and leave unfinished collections for resuming"""
+        if self.steps is not None:
+            self.steps.close()
+            self.set_item(self.current, 'PENDING')
+            self.steps = None
+
+        self.renderer.end()
+        write_render_matrix(self.output_path, self.renderer.matrix)
+        if self.renderer.preview is not None and self.renderer.preview.contact_sheet:
+            write_contact_sheet(self.output_path, self.renderer.matrix)
+        if self.renderer.profiler is not None:
+            self.renderer.profiler.write(self.output_path)
+        save_queue_state(context.scene, self.output_path)
+
+        bpy.app.handlers.render_complete.remove(self.on_render_complete)
+        bpy.app.handlers.render_cancel.remove(self.on_render_cancel)
+        context.window_manager.event_timer_remove(self.timer)
+        context.window_manager.progress_end()
+
+        rendered_count = len(self.renderer.rendered)
+        RENDER_OT_collections_queue.is_running = False
+        RENDER_OT_collections_queue.status_text = ""
+        self.report({'INFO'}, f"Rendered {rendered_count} collections. Saved to: {self.output_path}")
+        print(f"Rendered {rendered_count} collections. Images saved to: {self.output_path}")
+        return {'CANCELLED'} if self.cancelled else {'FINISHED'}
+
+
+class RENDER_OT_clear_render_cache(bpy.types.Operator):
+    """Forget the fingerprints of rendered collections so everything renders again"""
+    bl_idname = "render.clear_collections_render_cache"
+    bl_label = "Clear Render Cache"
+
+    def execute(self, context):
+        output_path = scene_output_path(context.scene)
+        cache_path = os.path.join(output_path, RenderCache.file_name)
+
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+            self.report({'INFO'}, "Render cache cleared.")
+        else:
+            self.report({'INFO'}, "No render cache to clear.")
+        return {'FINISHED'}
 
 class RenderCollectionListItem(bpy.types.PropertyGroup):
     """Item for the collection render list"""
     name: bpy.props.StringProperty(name="Collection Name")
+    status: bpy.props.EnumProperty(
+        name="Status",
+        items=[
+            ('PENDING', "Pending", "Not rendered yet"),
+            ('RENDERING', "Rendering", "Currently rendering"),
+            ('DONE', "Done", "Rendered"),
+            ('SKIPPED', "Skipped", "Unchanged since the last render"),
+            ('FAILED', "Failed", "Rendering failed"),
+        ],
+        default='PENDING'
+    )
+    render_time: bpy.props.FloatProperty(name="Render Time", unit='TIME_ABSOLUTE')
+
+class RENDER_UL_collections(bpy.types.UIList):
+    """Render list with the queue status and render time of each collection"""
+    status_icons = {
+        'PENDING': 'BLANK1',
+        'RENDERING': 'RENDER_STILL',
+        'DONE': 'CHECKMARK',
+        'SKIPPED': 'FORWARD',
+        'FAILED': 'ERROR',
+    }
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row()
+        row.label(text=item.name, icon=self.status_icons[item.status])
+        if item.render_time:
+            row.label(text=f"{item.render_time:.1f}s")
 
 class RENDER_PT_collections_panel(bpy.types.Panel):
     """Panel to render collections separately"""
@@ -197,29 +2040,120 @@ class RENDER_PT_collections_panel(bpy.types.Panel):
         layout = self.layout
         scene = context.scene
         
-        layout.operator(RENDER_OT_add_collections.bl_idname)
+        row = layout.row(align=True)
+        row.operator(RENDER_OT_add_collections.bl_idname)
+        row.operator(RENDER_OT_add_collections.bl_idname, text="", icon='FILE_REFRESH').rebuild = True
+
+        box = layout.box()
+        box.prop(scene, "render_collections_include")
+        box.prop(scene, "render_collections_exclude")
+        box.prop(scene, "render_collections_parent")
+        row = box.row()
+        row.prop(scene, "render_collections_min_objects")
+        row.prop(scene, "render_collections_required_property", text="Property")
+        box.prop(scene, "render_collections_auto_sync")
         
         layout.label(text="Collections to Render:")
         
         # Display the list with a remove button
         row = layout.row()
-        row.template_list("UI_UL_list", "render_collections", scene, "render_collections_list", scene, "render_collections_list_index")
+        row.template_list("RENDER_UL_collections", "render_collections", scene, "render_collections_list", scene, "render_collections_list_index")
         
         col = row.column(align=True)
         col.operator("render.remove_collection_from_list", icon='X', text="")
 
         layout.operator(RENDER_OT_collections_with_lineart.bl_idname)
+        if RENDER_OT_collections_queue.is_running:
+            box = layout.box()
+            box.label(text=RENDER_OT_collections_queue.status_text, icon='RENDER_STILL')
+            box.label(text="Press Esc to cancel")
+        else:
+            row = layout.row(align=True)
+            row.operator(RENDER_OT_collections_queue.bl_idname)
+            row.operator(RENDER_OT_collections_queue.bl_idname, text="Resume").resume = True
         layout.prop(scene, "render_collections_lineart")
+        row = layout.row()
+        row.enabled = scene.render_collections_lineart
+        row.prop(scene, "render_collections_single_pass")
         layout.prop(scene, "render_collections_output_path")
+        layout.prop(scene, "render_collections_tier", expand=True)
+        if scene.render_collections_tier == 'PREVIEW':
+            box = layout.box()
+            row = box.row(align=True)
+            row.prop(scene, "render_collections_preview_resolution")
+            row.prop(scene, "render_collections_preview_samples")
+            row = box.row(align=True)
+            row.prop(scene, "render_collections_preview_subdivision")
+            row.prop(scene, "render_collections_preview_denoise")
+            box.prop(scene, "render_collections_contact_sheet")
+        row = layout.row(align=True)
+        row.prop(scene, "render_collections_camera_pattern")
+        row.prop(scene, "render_collections_camera_folders", icon='FILE_FOLDER', text="")
+        row = layout.row(align=True)
+        row.prop(scene, "render_collections_use_cache")
+        row.operator(RENDER_OT_clear_render_cache.bl_idname, icon='TRASH', text="")
+        layout.prop(scene, "render_collections_profile")
+
+        row = layout.row(align=True)
+        row.prop(scene, "render_collections_file_format", text="")
+        row.prop(scene, "render_collections_compression")
+        layout.prop(scene, "render_collections_async_write")
+        col = layout.column()
+        col.enabled = scene.render_collections_async_write and scene.render_collections_file_format != 'OPEN_EXR'
+        col.prop(scene, "render_collections_composite_lineart")
+        col.prop(scene, "render_collections_thumbnail_size")
+
+        row = layout.row(align=True)
+        row.prop(scene, "render_collections_farm_mode")
+        sub = row.row(align=True)
+        sub.enabled = scene.render_collections_farm_mode
+        sub.prop(scene, "render_collections_workers")
 
 def register():
     bpy.utils.register_class(RENDER_OT_add_collections)
     bpy.utils.register_class(RENDER_OT_remove_collection)
     bpy.utils.register_class(RENDER_OT_collections_with_lineart)
+    bpy.utils.register_class(RENDER_OT_clear_render_cache)
+    bpy.utils.register_class(RENDER_OT_collections_queue)
     bpy.utils.register_class(RenderCollectionListItem)
+    bpy.utils.register_class(RENDER_UL_collections)
     bpy.utils.register_class(RENDER_PT_collections_panel)
     bpy.types.Scene.render_collections_list = bpy.props.CollectionProperty(type=RenderCollectionListItem)
     bpy.types.Scene.render_collections_list_index = bpy.props.IntProperty()
+    bpy.types.Scene.render_collections_include = bpy.props.StringProperty(
+        name="Include",
+        description="Comma separated name patterns of collections to add (glob, or re: for a regular expression)",
+        default="*"
+    )
+    bpy.types.Scene.render_collections_exclude = bpy.props.StringProperty(
+        name="Exclude",
+        description="Comma separated name patterns of collections to leave out (glob, or re: for a regular expression)",
+        default="tech_*, c_*, lights_all"
+    )
+    bpy.types.Scene.render_collections_parent = bpy.props.PointerProperty(
+        name="Parent",
+        description="Only add collections inside this collection",
+        type=bpy.types.Collection
+    )
+    bpy.types.Scene.render_collections_min_objects = bpy.props.IntProperty(
+        name="Min Objects",
+        description="Only add collections with at least this many objects",
+        default=0,
+        min=0
+    )
+    bpy.types.Scene.render_collections_required_property = bpy.props.StringProperty(
+        name="Custom Property",
+        description="Only add collections where this custom property is set",
+        default=""
+    )
+    bpy.types.Scene.render_collections_auto_sync = bpy.props.BoolProperty(
+        name="Auto Sync",
+        description="Add new and remove deleted collections automatically as the scene changes",
+        default=False,
+        update=update_auto_sync
+    )
+    bpy.app.handlers.depsgraph_update_post.append(auto_sync_render_list)
+    bpy.app.handlers.load_post.append(clear_known_collections)
     bpy.types.Scene.render_collections_output_path = bpy.props.StringProperty(
         name="Output Folder",
         description="Folder to save rendered images",
@@ -231,16 +2165,174 @@ def register():
         description="Also render line art for each collection",
         default=False
     )
+    bpy.types.Scene.render_collections_single_pass = bpy.props.BoolProperty(
+        name="Single Pass",
+        description="Render beauty and line art together, using a line art view layer and File Output compositor nodes",
+        default=False
+    )
+    bpy.types.Scene.render_collections_tier = bpy.props.EnumProperty(
+        name="Quality",
+        description="Render quality tier, each tier saves into its own subfolder",
+        items=[
+            ('PREVIEW', "Preview", "Quick low quality renders to check placement"),
+            ('FINAL', "Final", "Full quality renders with the scene's render settings"),
+        ],
+        default='FINAL'
+    )
+    bpy.types.Scene.render_collections_preview_resolution = bpy.props.IntProperty(
+        name="Resolution",
+        description="Resolution percentage of preview renders",
+        default=25,
+        min=1,
+        max=100,
+        subtype='PERCENTAGE'
+    )
+    bpy.types.Scene.render_collections_preview_samples = bpy.props.IntProperty(
+        name="Samples",
+        description="Render samples of preview renders",
+        default=16,
+        min=1
+    )
+    bpy.types.Scene.render_collections_preview_subdivision = bpy.props.IntProperty(
+        name="Max Subdivision",
+        description="Simplify the subdivision level of preview renders to at most this value",
+        default=0,
+        min=0,
+        max=6
+    )
+    bpy.types.Scene.render_collections_preview_denoise = bpy.props.BoolProperty(
+        name="Denoise",
+        description="Denoise preview renders",
+        default=True
+    )
+    bpy.types.Scene.render_collections_contact_sheet = bpy.props.BoolProperty(
+        name="Contact Sheet",
+        description="Combine all preview renders into contact_sheet.png",
+        default=True
+    )
+    bpy.types.Scene.render_collections_camera_pattern = bpy.props.StringProperty(
+        name="Cameras",
+        description="Render from every camera whose name matches this pattern (e.g. cam_*). Empty uses the active camera",
+        default=""
+    )
+    bpy.types.Scene.render_collections_camera_folders = bpy.props.BoolProperty(
+        name="Folder per Camera",
+        description="Save the images of each camera in its own subfolder",
+        default=False
+    )
+    bpy.types.Scene.render_collections_use_cache = bpy.props.BoolProperty(
+        name="Skip Unchanged",
+        description="Only render collections whose content or render settings changed since the last render",
+        default=False
+    )
+    bpy.types.Scene.render_collections_profile = bpy.props.BoolProperty(
+        name="Write Render Report",
+        description="Save timing, memory, polygon count and file size of every render pass as JSON and CSV",
+        default=False
+    )
+    bpy.types.Scene.render_collections_file_format = bpy.props.EnumProperty(
+        name="File Format",
+        description="Format of the rendered images",
+        items=[
+            ('PNG', "PNG", "Lossless PNG"),
+            ('WEBP', "WebP", "WebP, encoded in the background with Pillow when Encode in Background is enabled"),
+            ('OPEN_EXR', "OpenEXR", "OpenEXR, always written by Blender"),
+        ],
+        default='PNG'
+    )
+    bpy.types.Scene.render_collections_compression = bpy.props.IntProperty(
+        name="Compression",
+        description="Compression level (0 = fastest, 100 = smallest)",
+        default=15,
+        min=0,
+        max=100,
+        subtype='PERCENTAGE'
+    )
+    bpy.types.Scene.render_collections_async_write = bpy.props.BoolProperty(
+        name="Encode in Background",
+        description="Write uncompressed images while rendering and encode them on background threads",
+        default=False
+    )
+    bpy.types.Scene.render_collections_composite_lineart = bpy.props.BoolProperty(
+        name="Composite Line Art",
+        description="Also save the line art composited over the beauty image as <name>_<camera>_composite",
+        default=False
+    )
+    bpy.types.Scene.render_collections_thumbnail_size = bpy.props.IntProperty(
+        name="Thumbnail Size",
+        description="Also save a thumbnail with this longest side as <name>_<camera>_thumb (0 = no thumbnail)",
+        default=0,
+        min=0,
+        max=2048
+    )
+    bpy.types.Scene.render_collections_farm_mode = bpy.props.BoolProperty(
+        name="Background Workers",
+        description="Render the collections in parallel background Blender processes",
+        default=False
+    )
+    bpy.types.Scene.render_collections_workers = bpy.props.IntProperty(
+        name="Workers",
+        description="Number of background Blender processes to start",
+        default=4,
+        min=1,
+        max=64
+    )
 
 def unregister():
     bpy.utils.unregister_class(RENDER_OT_add_collections)
     bpy.utils.unregister_class(RENDER_OT_remove_collection)
     bpy.utils.unregister_class(RENDER_OT_collections_with_lineart)
+    bpy.utils.unregister_class(RENDER_OT_clear_render_cache)
+    bpy.utils.unregister_class(RENDER_OT_collections_queue)
     bpy.utils.unregister_class(RenderCollectionListItem)
+    bpy.utils.unregister_class(RENDER_UL_collections)
     bpy.utils.unregister_class(RENDER_PT_collections_panel)
     del bpy.types.Scene.render_collections_list
     del bpy.types.Scene.render_collections_list_index
+    del bpy.types.Scene.render_collections_include
+    del bpy.types.Scene.render_collections_exclude
+    del bpy.types.Scene.render_collections_parent
+    del bpy.types.Scene.render_collections_min_objects
+    del bpy.types.Scene.render_collections_required_property
+    del bpy.types.Scene.render_collections_auto_sync
+    bpy.app.handlers.depsgraph_update_post.remove(auto_sync_render_list)
+    bpy.app.handlers.load_post.remove(clear_known_collections)
+    known_collections.clear()
     del bpy.types.Scene.render_collections_output_path
+    del bpy.types.Scene.render_collections_lineart
+    del bpy.types.Scene.render_collections_single_pass
+    del bpy.types.Scene.render_collections_tier
+    del bpy.types.Scene.render_collections_preview_resolution
+    del bpy.types.Scene.render_collections_preview_samples
+    del bpy.types.Scene.render_collections_preview_subdivision
+    del bpy.types.Scene.render_collections_preview_denoise
+    del bpy.types.Scene.render_collections_contact_sheet
+    del bpy.types.Scene.render_collections_camera_pattern
+    del bpy.types.Scene.render_collections_camera_folders
+    del bpy.types.Scene.render_collections_use_cache
+    del bpy.types.Scene.render_collections_profile
+    del bpy.types.Scene.render_collections_file_format
+    del bpy.types.Scene.render_collections_compression
+    del bpy.types.Scene.render_collections_async_write
+    del bpy.types.Scene.render_collections_composite_lineart
+    del bpy.types.Scene.render_collections_thumbnail_size
+    del bpy.types.Scene.render_collections_farm_mode
+    del bpy.types.Scene.render_collections_workers
 
 if __name__ == "__main__":
-    register()
+    # Command line use:
+    #   blender -b file.blend --python render_collections.py -- --manifest job.json
+    # Background workers are started as:
+    #   blender -b file.blend --python render_collections.py -- --worker job.json
+    parser = argparse.ArgumentParser(prog="render_collections.py")
+    parser.add_argument("--manifest", help="JSON file listing .blend files, collections, cameras and outputs to render")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+
+    if args.worker:
+        run_worker(args.worker)
+    elif args.manifest:
+        register()
+        sys.exit(run_manifest(args.manifest))
+    else:
+        register()
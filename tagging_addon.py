@@ -1,4 +1,19 @@
 import bpy
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+import shutil
+import sqlite3
+import re
+import csv
+import hashlib
+import array
+import math
+import bmesh
+from mathutils import Vector
 
 bl_info = {
     "name": "Batch Asset Manager",
@@ -23,7 +38,7 @@ class ASSET_OT_AddTagToList(bpy.types.Operator):
             return {'CANCELLED'}
         
         if context.scene.single_words:
-            tags = new_tag.split(" ")
+            tags = new_tag.split()
             for tag in tags:
                 self.add_tag(context.scene.tag_list, tag)
         else:
@@ -74,101 +89,918 @@ class ASSET_OT_AddDefaultTags(bpy.types.Operator):
 
         return {'FINISHED'}
 
-# Operators for Applying Tags
-class ASSET_OT_AddListedTags(bpy.types.Operator):
-    """Add All Tags in the List to Selected Assets"""
-    bl_idname = "asset.add_listed_tags"
-    bl_label = "Add Listed Tags"
+# Tag Changesets
+def tag_diff(current_tags, operations):
+    """Minimal tags to add and remove so a tag set reflects the operations, as two sets"""
+    tags = set(operations["set"]) if "set" in operations else set(current_tags)
+    tags.update(operations.get("add", []))
+    tags.difference_update(operations.get("remove", []))
+    for old_tag, new_tag in operations.get("replace", []):
+        if old_tag in tags:
+            tags.discard(old_tag)
+            tags.add(new_tag)
+    return tags - current_tags, current_tags - tags
 
-    def execute(self, context):
-        tag_list = [item.name for item in context.scene.tag_list]
-        assets = context.selected_assets
-        if not assets:
+def metadata_diff(metadata, operations):
+    """Metadata fields the operations fill with a new value"""
+    return {
+        field: value for field, value in operations.get("metadata", {}).items()
+        if value and getattr(metadata, field) != value
+    }
+
+def apply_tag_diff(tags, to_add, to_remove):
+    """Apply a tag diff to an asset's tag collection"""
+    for tag in to_remove:
+        tags.remove(tags[tag])
+    for tag in to_add:
+        tags.new(tag)
+
+class TagChangeset:
+    """Tag changes of a whole asset selection, computed before anything is written
+
+    Built from (metadata, operations) pairs. Every asset's tags are read once,
+    only assets whose tags or metadata fields actually change are kept.
+    """
+    def __init__(self, asset_operations):
+        self.changes = []
+        for metadata, operations in asset_operations:
+            current_tags = {tag.name for tag in metadata.tags}
+            to_add, to_remove = tag_diff(current_tags, operations)
+            fields = metadata_diff(metadata, operations)
+            if to_add or to_remove or fields:
+                self.changes.append((metadata, to_add, to_remove, fields))
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def summary(self):
+        """Lines describing the changeset, for the dry run"""
+        added = sum(len(to_add) for metadata, to_add, to_remove, fields in self.changes)
+        removed = sum(len(to_remove) for metadata, to_add, to_remove, fields in self.changes)
+        filled = sum(len(fields) for metadata, to_add, to_remove, fields in self.changes)
+        summary = [
+            f"Assets affected: {len(self.changes)}",
+            f"Tags added: {added}",
+            f"Tags removed: {removed}",
+        ]
+        if filled:
+            summary.append(f"Metadata fields changed: {filled}")
+        return summary
+
+    def apply(self):
+        for metadata, to_add, to_remove, fields in self.changes:
+            apply_tag_diff(metadata.tags, to_add, to_remove)
+            for field, value in fields.items():
+                setattr(metadata, field, value)
+        return len(self.changes)
+
+class TagChangesetOperator:
+    """Shared dry run and apply steps of the operators editing tags of the selected assets
+
+    The summary is shown in a dialog on invoke, the changeset is applied as one undo step.
+    """
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def tag_operations(self, context):
+        raise NotImplementedError
+
+    def asset_operations(self, context):
+        """(metadata, operations) of every selected asset, the same operations for all by default"""
+        operations = self.tag_operations(context)
+        return ((asset.metadata, operations) for asset in context.selected_assets)
+
+    def changeset(self, context):
+        return TagChangeset(self.asset_operations(context))
+
+    def invoke(self, context, event):
+        if not context.selected_assets:
             self.report({'WARNING'}, "No assets selected.")
             return {'CANCELLED'}
 
-        for asset in assets:
-            for tag in tag_list:
-                asset.metadata.tags.new(tag, skip_if_exists=True)
-        
-        self.report({'INFO'}, f"Added {len(tag_list)} tag(s) to {len(assets)} asset(s).")
-        return {'FINISHED'}
+        self.summary = self.changeset(context).summary()
+        return context.window_manager.invoke_props_dialog(self)
 
-class ASSET_OT_RemoveListedTags(bpy.types.Operator):
-    """Remove All Tags in the List from Selected Assets"""
-    bl_idname = "asset.remove_listed_tags"
-    bl_label = "Remove Listed Tags"
+    def draw(self, context):
+        for line in self.summary:
+            self.layout.label(text=line)
 
     def execute(self, context):
-        tag_list = [item.name for item in context.scene.tag_list]
-        assets = context.selected_assets
-        if not assets:
+        if not context.selected_assets:
             self.report({'WARNING'}, "No assets selected.")
             return {'CANCELLED'}
 
-        for asset in assets:
-            for tag in tag_list:
-                tag_to_remove = asset.metadata.tags.get(tag)
-                if tag_to_remove is not None:
-                    asset.metadata.tags.remove(tag_to_remove)
-        
-        self.report({'INFO'}, f"Removed {len(tag_list)} tag(s) from {len(assets)} asset(s).")
+        changeset = self.changeset(context)
+        if not changeset:
+            self.report({'INFO'}, "Selected assets are already up to date.")
+            return {'CANCELLED'}
+
+        changeset.apply()
+        self.report({'INFO'}, ", ".join(changeset.summary()))
         return {'FINISHED'}
 
+# Operators for Applying Tags
+class ASSET_OT_AddListedTags(TagChangesetOperator, bpy.types.Operator):
+    """Add All Tags in the List to Selected Assets"""
+    bl_idname = "asset.add_listed_tags"
+    bl_label = "Add Listed Tags"
+
+    def tag_operations(self, context):
+        return {"add": [item.name for item in context.scene.tag_list]}
+
+class ASSET_OT_RemoveListedTags(TagChangesetOperator, bpy.types.Operator):
+    """Remove All Tags in the List from Selected Assets"""
+    bl_idname = "asset.remove_listed_tags"
+    bl_label = "Remove Listed Tags"
+
+    def tag_operations(self, context):
+        return {"remove": [item.name for item in context.scene.tag_list]}
+
 # Single Tag Replacement
-class ASSET_OT_ReplaceTag(bpy.types.Operator):
+class ASSET_OT_ReplaceTag(TagChangesetOperator, bpy.types.Operator):
     """Replace Tag for Selected Assets"""
     bl_idname = "asset.replace_tag"
     bl_label = "Replace Tag"
-    bl_options = {'REGISTER', 'UNDO'}
+
+    def tag_operations(self, context):
+        return {"replace": [[context.scene.old_tag, context.scene.new_tag]]}
+    
+# Automatic Tagging
+NAME_TOKEN_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])")
+
+# Derived tags by datablock session_uid, as (rules key, tags, is collection)
+auto_tag_cache = {}
+
+class AutoTagRules(bpy.types.PropertyGroup):
+    """Rules deriving tags from the content and naming of assets"""
+    name_tokens: bpy.props.BoolProperty(name="Name Words", description="Tag the words of the asset name", default=True)
+    ignored_tokens: bpy.props.StringProperty(
+        name="Ignored Words",
+        description="Comma separated name words that never become tags",
+        default="geo, mesh, obj, low, high"
+    )
+    collections: bpy.props.BoolProperty(name="Collections", description="Tag the parent collection names", default=True)
+    materials: bpy.props.BoolProperty(name="Materials", description="Tag the material names", default=False)
+    polycount: bpy.props.BoolProperty(name="Polygon Count", description="Tag lowpoly, midpoly or highpoly", default=True)
+    lowpoly_limit: bpy.props.IntProperty(name="Lowpoly Below", default=5000, min=0)
+    highpoly_limit: bpy.props.IntProperty(name="Highpoly From", default=50000, min=0)
+    dimensions: bpy.props.BoolProperty(name="Dimensions", description="Tag small, medium or large", default=True)
+    small_size: bpy.props.FloatProperty(name="Small Below", default=0.5, min=0.0, subtype='DISTANCE')
+    large_size: bpy.props.FloatProperty(name="Large From", default=5.0, min=0.0, subtype='DISTANCE')
+    rigs: bpy.props.BoolProperty(name="Armatures", description="Tag rigged assets", default=True)
+    modifiers: bpy.props.BoolProperty(name="Modifiers", description="Tag the modifier types", default=False)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__annotations__}
+
+def clean_name(name):
+    """Datablock name without the .001 style duplicate suffix"""
+    return re.sub(r"\.\d+$", "", name)
+
+def name_tokens(name, ignored_tokens):
+    """Lowercase words of a snake_case, camelCase or spaced name"""
+    tokens = {token.lower() for token in NAME_TOKEN_PATTERN.findall(clean_name(name))}
+    return {token for token in tokens if len(token) > 2 and token not in ignored_tokens}
+
+def collection_parents():
+    """Parent collection names of every collection"""
+    parents = {}
+    for collection in bpy.data.collections:
+        for child in collection.children:
+            parents.setdefault(child.name, []).append(collection.name)
+    return parents
+
+def asset_objects(datablock):
+    """Objects making up an object or collection asset"""
+    if isinstance(datablock, bpy.types.Collection):
+        return list(datablock.all_objects)
+    if isinstance(datablock, bpy.types.Object):
+        objects = [datablock]
+        for obj in objects:
+            objects.extend(obj.children)
+        return objects
+    return []
+
+def derive_tags(datablock, rules, parents):
+    """Tags of an asset according to the auto tagging rules"""
+    tags = set()
+    objects = asset_objects(datablock)
+
+    if rules["name_tokens"]:
+        ignored_tokens = {token.strip().lower() for token in rules["ignored_tokens"].split(",")}
+        tags |= name_tokens(datablock.name, ignored_tokens)
+
+    if rules["collections"]:
+        if isinstance(datablock, bpy.types.Collection):
+            tags.update(clean_name(name) for name in parents.get(datablock.name, []))
+        elif isinstance(datablock, bpy.types.Object):
+            tags.update(clean_name(collection.name) for collection in datablock.users_collection)
+
+    if rules["materials"]:
+        for obj in objects:
+            tags.update(clean_name(slot.material.name) for slot in obj.material_slots if slot.material)
+
+    if rules["polycount"]:
+        if isinstance(datablock, bpy.types.Mesh):
+            meshes = [datablock]
+        else:
+            meshes = [obj.data for obj in objects if obj.type == 'MESH']
+        if meshes:
+            polygon_count = sum(len(mesh.polygons) for mesh in meshes)
+            if polygon_count < rules["lowpoly_limit"]:
+                tags.add("lowpoly")
+            elif polygon_count < rules["highpoly_limit"]:
+                tags.add("midpoly")
+            else:
+                tags.add("highpoly")
+
+    if rules["dimensions"] and objects:
+        corners = [obj.matrix_world @ Vector(corner) for obj in objects for corner in obj.bound_box]
+        size = max(max(corner[axis] for corner in corners) - min(corner[axis] for corner in corners) for axis in range(3))
+        if size < rules["small_size"]:
+            tags.add("small")
+        elif size < rules["large_size"]:
+            tags.add("medium")
+        else:
+            tags.add("large")
+
+    for obj in objects:
+        modifier_types = {modifier.type for modifier in obj.modifiers}
+        if rules["rigs"] and (obj.type == 'ARMATURE' or 'ARMATURE' in modifier_types):
+            tags.add("rigged")
+        if rules["modifiers"]:
+            tags.update(modifier_type.lower() for modifier_type in modifier_types if modifier_type != 'ARMATURE')
+
+    return tags
+
+def cached_auto_tags(datablock, rules, rules_key, parents, depsgraph):
+    """Derived tags of an asset, only analyzed again when the asset or the rules changed
+
+    Only assets the depsgraph evaluates report their changes, the others are analyzed every time.
+    """
+    cached = auto_tag_cache.get(datablock.session_uid)
+    if cached is not None and cached[0] == rules_key:
+        return cached[1]
+
+    tags = derive_tags(datablock, rules, parents)
+    if datablock.evaluated_get(depsgraph).is_evaluated:
+        auto_tag_cache[datablock.session_uid] = (rules_key, tags, isinstance(datablock, bpy.types.Collection))
+    return tags
+
+@bpy.app.handlers.persistent
+def invalidate_auto_tags(scene, depsgraph):
+    """Forget the derived tags of changed datablocks, their parent objects and the collections
+
+    Material and collection changes (relinked objects, renamed materials) can affect any asset,
+    they clear everything.
+    """
+    if not auto_tag_cache:
+        return
+    if depsgraph.id_type_updated('MATERIAL') or depsgraph.id_type_updated('COLLECTION'):
+        auto_tag_cache.clear()
+        return
+
+    objects_changed = False
+    for update in depsgraph.updates:
+        datablock = update.id.original
+        auto_tag_cache.pop(datablock.session_uid, None)
+        if isinstance(datablock, bpy.types.Object):
+            objects_changed = True
+            parent = datablock.parent
+            while parent is not None:
+                auto_tag_cache.pop(parent.session_uid, None)
+                parent = parent.parent
+
+    if objects_changed:
+        for session_uid in [uid for uid, cached in auto_tag_cache.items() if cached[2]]:
+            del auto_tag_cache[session_uid]
+
+# Owner of the rename subscriptions, renames don't go through the depsgraph
+auto_tag_msgbus_owner = object()
+
+def subscribe_auto_tag_renames():
+    for id_type in (bpy.types.Object, bpy.types.Collection, bpy.types.Material, bpy.types.Mesh):
+        bpy.msgbus.subscribe_rna(
+            key=(id_type, "name"),
+            owner=auto_tag_msgbus_owner,
+            args=(None,),
+            notify=clear_auto_tags,
+        )
+
+@bpy.app.handlers.persistent
+def clear_auto_tags(dummy):
+    auto_tag_cache.clear()
+
+@bpy.app.handlers.persistent
+def reset_auto_tags(dummy):
+    """Forget the derived tags of the previous file and subscribe to renames again, loading drops subscriptions"""
+    auto_tag_cache.clear()
+    subscribe_auto_tag_renames()
+
+class ASSET_OT_AutoTag(TagChangesetOperator, bpy.types.Operator):
+    """Add tags derived by the auto tagging rules to the selected local assets"""
+    bl_idname = "asset.auto_tag"
+    bl_label = "Auto Tag"
+
+    def asset_operations(self, context):
+        rules = context.scene.auto_tag_rules.as_dict()
+        rules_key = tuple(sorted(rules.items()))
+        parents = collection_parents()
+        depsgraph = context.evaluated_depsgraph_get()
+        for asset in context.selected_assets:
+            datablock = asset.local_id
+            if datablock is None:
+                continue
+            tags = cached_auto_tags(datablock, rules, rules_key, parents, depsgraph)
+            yield datablock.asset_data, {"add": sorted(tags)}
+
+# Library Batch Operations
+ASSET_ID_TYPES = (
+    "actions", "brushes", "collections", "materials", "meshes",
+    "node_groups", "objects", "worlds",
+)
+ASSET_METADATA_FIELDS = ("description", "license", "copyright", "author")
+
+def iter_local_assets():
+    """Yield every datablock of the open file that is marked as an asset"""
+    for id_type in ASSET_ID_TYPES:
+        for datablock in getattr(bpy.data, id_type, ()):
+            if datablock.asset_data is not None and datablock.library is None:
+                yield datablock
+
+def find_blend_files(directory):
+    """Recursively find the .blend files of an asset library directory"""
+    blend_files = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(".blend"):
+                blend_files.append(os.path.join(root, file_name))
+    return blend_files
+
+def apply_tag_operations(metadata, operations):
+    """Apply a set of tag and metadata operations to asset metadata, return True if anything changed"""
+    to_add, to_remove = tag_diff({tag.name for tag in metadata.tags}, operations)
+    fields = metadata_diff(metadata, operations)
+    apply_tag_diff(metadata.tags, to_add, to_remove)
+    for field, value in fields.items():
+        setattr(metadata, field, value)
+    return bool(to_add or to_remove or fields)
+
+def tag_operations_from_scene(scene):
+    """The operation set of the library batch, built from the panel fields"""
+    operation = scene.library_operation
+    if operation == 'ADD':
+        return {"add": [item.name for item in scene.tag_list]}
+    if operation == 'REMOVE':
+        return {"remove": [item.name for item in scene.tag_list]}
+    if operation == 'REPLACE':
+        return {"replace": [[scene.old_tag, scene.new_tag]]}
+    if operation == 'MAPPING':
+        return {"replace": tag_mapping_pairs(scene)}
+    if operation == 'PRESET':
+        return preset_operations(load_presets().get(scene.asset_preset, {}))
+    return {"metadata": {
+        "description": scene.asset_description,
+        "license": scene.asset_license,
+        "copyright": scene.asset_copyright,
+        "author": scene.asset_author,
+    }}
+
+def asset_record(datablock):
+    """Name, type, tags and metadata of an asset, as stored in the library index"""
+    metadata = datablock.asset_data
+    record = {
+        "name": datablock.name,
+        "type": datablock.id_type,
+        "tags": [tag.name for tag in metadata.tags],
+    }
+    for field in ASSET_METADATA_FIELDS:
+        record[field] = getattr(metadata, field, "") or ""
+    return record
+
+def run_library_worker(job_path):
+    """Edit or index the assets of the listed files, used by the background workers
+
+    Jobs in 'EDIT' mode apply the job's operations, or the per-asset operations
+    of "asset_operations" when given. 'INDEX' mode only reads the assets,
+    'PREVIEW' mode renders previews of the changed ones.
+    """
+    with open(job_path) as job_file:
+        job = json.load(job_file)
+
+    mode = job.get("mode", 'EDIT')
+    selections = job.get("assets", {})
+    results = []
+    for blend_path in job["files"]:
+        result = {"file": blend_path, "assets": 0, "changed": 0, "error": None}
+        if mode == 'INDEX':
+            result["records"] = []
+        if mode == 'PREVIEW':
+            result["previews"] = []
+
+        # Only the listed assets of the file, when the job has a selection
+        selected = None
+        if blend_path in selections:
+            selected = {(id_type, name) for id_type, name in selections[blend_path]}
+        per_asset = job.get("asset_operations", {}).get(blend_path)
+
+        try:
+            # With the file's own UI, so saving keeps the authors' workspaces and layouts
+            bpy.ops.wm.open_mainfile(filepath=blend_path, load_ui=True)
+            studio = PreviewStudio(job["preview"]) if mode == 'PREVIEW' else None
+            found = set()
+            for datablock in iter_local_assets():
+                if selected is not None and (datablock.id_type, datablock.name) not in selected:
+                    continue
+                operations = job.get("operations")
+                if per_asset is not None:
+                    key = asset_key(datablock.id_type, datablock.name)
+                    if key not in per_asset:
+                        continue
+                    operations = per_asset[key]
+                    found.add(key)
+                result["assets"] += 1
+                if mode == 'INDEX':
+                    result["records"].append(asset_record(datablock))
+                elif mode == 'PREVIEW':
+                    if studio.update_preview(datablock, result):
+                        result["changed"] += 1
+                elif apply_tag_operations(datablock.asset_data, operations):
+                    result["changed"] += 1
+            if per_asset is not None:
+                result["missing"] = sorted(set(per_asset) - found)
+            if studio is not None:
+                studio.remove()
+            if result["changed"] and job.get("save", True):
+                bpy.ops.wm.save_mainfile(filepath=blend_path)
+        except Exception as error:
+            # Any failure is recorded for its file, the remaining files still run
+            result["error"] = f"{type(error).__name__}: {error}"
+        print(f"{blend_path}: {result['changed']}/{result['assets']} asset(s) changed")
+        results.append(result)
+
+    with open(job["result_path"], "w") as result_file:
+        json.dump(results, result_file)
+
+def run_library_batch(blend_files, job_settings, worker_count, on_result=None):
+    """Split .blend files between background Blender workers and wait for them
+
+    The job settings (mode, operations, asset selection) are shared by all workers.
+    Returns one result per file, or passes them to on_result as in run_library_jobs.
+    """
+    if not blend_files:
+        return []
+
+    worker_count = max(1, min(worker_count, len(blend_files)))
+    jobs = []
+    for worker_index in range(worker_count):
+        job = dict(job_settings)
+        job["files"] = blend_files[worker_index::worker_count]
+        jobs.append(job)
+    return run_library_jobs(jobs, on_result)
+
+def run_library_jobs(jobs, on_result=None):
+    """Run one background Blender worker per job and wait for them, return the results of all jobs
+
+    With on_result, the results of each worker are passed to it as soon as the worker
+    finished instead of being collected, so they never all stay in memory.
+    """
+    batch_dir = tempfile.mkdtemp(prefix="asset_batch_")
+
+    workers = []
+    for worker_index, job in enumerate(jobs):
+        job["result_path"] = os.path.join(batch_dir, f"result_{worker_index}.json")
+        job_path = os.path.join(batch_dir, f"job_{worker_index}.json")
+        with open(job_path, "w") as job_file:
+            json.dump(job, job_file)
+
+        log_path = os.path.join(batch_dir, f"worker_{worker_index}.log")
+        command = [
+            bpy.app.binary_path, "-b", "--factory-startup",
+            "--python", os.path.abspath(__file__),
+            "--", "--worker", job_path,
+        ]
+        log_file = open(log_path, "w")
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+        workers.append((process, job, log_file, log_path))
+
+    results = []
+    succeeded_logs = set()
+    try:
+        for process, job, log_file, log_path in workers:
+            return_code = process.wait()
+            log_file.close()
+
+            # A missing or unreadable result file means the worker stopped early
+            worker_results = None
+            try:
+                with open(job["result_path"]) as result_file:
+                    worker_results = json.load(result_file)
+            except (OSError, ValueError):
+                pass
+
+            if worker_results is None:
+                error = f"worker exited with code {return_code}, see {log_path}"
+                worker_results = [{"file": path, "assets": 0, "changed": 0, "error": error} for path in job["files"]]
+            elif not any(result["error"] for result in worker_results):
+                succeeded_logs.add(log_path)
+
+            if on_result is None:
+                results.extend(worker_results)
+            else:
+                for result in worker_results:
+                    on_result(result)
+    finally:
+        # Only the logs of failed workers are kept, the job and result files go
+        for process, job, log_file, log_path in workers:
+            log_file.close()
+        kept_logs = {log_path for process, job, log_file, log_path in workers} - succeeded_logs
+        for file_name in os.listdir(batch_dir):
+            path = os.path.join(batch_dir, file_name)
+            if path not in kept_logs:
+                os.remove(path)
+        if not kept_logs:
+            os.rmdir(batch_dir)
+
+    return results
+
+class ASSET_OT_BatchLibrary(bpy.types.Operator):
+    """Apply the chosen tag or metadata operation to every asset in the .blend files of a library folder"""
+    bl_idname = "asset.batch_library"
+    bl_label = "Apply to Library"
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
 
     def execute(self, context):
-        old_tag = context.scene.old_tag
-        new_tag = context.scene.new_tag
-        assets = context.selected_assets
-        if not assets:
-            self.report({'WARNING'}, "No assets selected.")
+        scene = context.scene
+        directory = bpy.path.abspath(scene.library_path)
+        if not os.path.isdir(directory):
+            self.report({'WARNING'}, "Library folder not found.")
             return {'CANCELLED'}
 
-        for asset in assets:
-            tag_to_remove = asset.metadata.tags.get(old_tag)
-            if tag_to_remove is not None:
-                asset.metadata.tags.remove(tag_to_remove)
-                asset.metadata.tags.new(new_tag, skip_if_exists=True)
-        
-        self.report({'INFO'}, f"Replaced tag '{old_tag}' with '{new_tag}' for {len(assets)} asset(s).")
+        if scene.library_operation == 'PRESET' and report_preset_error(self):
+            return {'CANCELLED'}
+        job_settings = {"mode": 'EDIT', "operations": tag_operations_from_scene(scene)}
+        if scene.library_scope == 'RESULTS':
+            # Only the assets found by the last index query
+            selections = {}
+            for item in scene.index_results:
+                selections.setdefault(item.file, []).append([item.id_type, item.name])
+            job_settings["assets"] = selections
+            blend_files = list(selections)
+        else:
+            blend_files = find_blend_files(directory)
+
+        results = run_library_batch(blend_files, job_settings, scene.library_workers)
+        if not results:
+            self.report({'WARNING'}, "No .blend files to edit.")
+            return {'CANCELLED'}
+
+        for result in results:
+            if result["error"]:
+                self.report({'WARNING'}, f"{result['file']}: {result['error']}")
+            else:
+                print(f"{result['file']}: {result['changed']}/{result['assets']} asset(s) changed")
+
+        changed_files = sum(1 for result in results if result["changed"])
+        failed_files = sum(1 for result in results if result["error"])
+        self.report({'INFO'}, f"Updated {changed_files} of {len(results)} file(s), {failed_files} failed.")
         return {'FINISHED'}
-    
-# Operators for Asset Information
-class ASSET_OT_EditMetadata(bpy.types.Operator):
-    """Edit Metadata of Selected Assets"""
-    bl_idname = "asset.edit_metadata"
-    bl_label = "Edit Metadata"
-    bl_options = {'REGISTER', 'UNDO'}
+
+# Asset Library Index
+class AssetIndex:
+    """SQLite index of the assets, tags and metadata of a library folder, stored in the folder
+
+    Usable from Python as well:
+        with AssetIndex(directory) as index:
+            index.query(tag="Shakal")
+    """
+    file_name = ".asset_index.sqlite"
+    schema = """
+        CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL, size INTEGER);
+        CREATE TABLE IF NOT EXISTS assets (
+            id INTEGER PRIMARY KEY, file TEXT, name TEXT, type TEXT,
+            description TEXT, license TEXT, copyright TEXT, author TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tags (asset_id INTEGER, tag TEXT);
+        CREATE INDEX IF NOT EXISTS assets_file ON assets (file);
+        CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+        CREATE INDEX IF NOT EXISTS tags_asset ON tags (asset_id);
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.connection = sqlite3.connect(os.path.join(directory, self.file_name))
+        self.connection.executescript(self.schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def stale_files(self):
+        """Library files that are new or changed since they were indexed, and indexed files that are gone"""
+        on_disk = {}
+        for blend_path in find_blend_files(self.directory):
+            stat = os.stat(blend_path)
+            on_disk[os.path.relpath(blend_path, self.directory)] = (stat.st_mtime, stat.st_size)
+
+        indexed = {path: (mtime, size) for path, mtime, size in self.connection.execute("SELECT * FROM files")}
+        changed = [path for path, stat in on_disk.items() if indexed.get(path) != stat]
+        deleted = [path for path in indexed if path not in on_disk]
+        return changed, deleted, on_disk
+
+    def update(self, worker_count):
+        """Re-index new and changed files in background workers, forget deleted ones
+
+        The records of each worker are inserted as soon as it finished. Returns the results
+        of the indexed files without their records.
+        """
+        changed, deleted, on_disk = self.stale_files()
+        blend_files = [os.path.join(self.directory, path) for path in changed]
+        results = []
+
+        def insert_result(result):
+            results.append({key: value for key, value in result.items() if key != "records"})
+            if not result["error"]:
+                path = os.path.relpath(result["file"], self.directory)
+                self.remove_file(path)
+                self.connection.execute("INSERT INTO files VALUES (?, ?, ?)", (path, *on_disk[path]))
+                for record in result["records"]:
+                    cursor = self.connection.execute(
+                        "INSERT INTO assets (file, name, type, description, license, copyright, author)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (path, record["name"], record["type"], *(record[field] for field in ASSET_METADATA_FIELDS))
+                    )
+                    self.connection.executemany(
+                        "INSERT INTO tags VALUES (?, ?)", [(cursor.lastrowid, tag) for tag in record["tags"]]
+                    )
+
+        with self.connection:
+            for path in deleted:
+                self.remove_file(path)
+            run_library_batch(blend_files, {"mode": 'INDEX'}, worker_count, insert_result)
+        return results
+
+    def remove_file(self, path):
+        self.connection.execute("DELETE FROM tags WHERE asset_id IN (SELECT id FROM assets WHERE file = ?)", (path,))
+        self.connection.execute("DELETE FROM assets WHERE file = ?", (path,))
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def query(self, tag="", name="", missing=""):
+        """Assets with a tag, a name matching a glob pattern, and/or an empty field ('tags' or a metadata field)"""
+        conditions = []
+        parameters = []
+        if tag:
+            conditions.append("id IN (SELECT asset_id FROM tags WHERE tag = ?)")
+            parameters.append(tag)
+        if name:
+            conditions.append("name GLOB ?")
+            parameters.append(name)
+        if missing == "tags":
+            conditions.append("id NOT IN (SELECT asset_id FROM tags)")
+        elif missing in ASSET_METADATA_FIELDS:
+            conditions.append(f"{missing} = ''")
+
+        sql = "SELECT id, file, name, type, description, license, copyright, author FROM assets"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY file, name"
+
+        assets = []
+        for row in self.connection.execute(sql, parameters):
+            asset = dict(zip(("id", "file", "name", "type", *ASSET_METADATA_FIELDS), row))
+            asset["file"] = os.path.join(self.directory, asset["file"])
+            asset["tags"] = [tag for tag, in self.connection.execute("SELECT tag FROM tags WHERE asset_id = ?", (row[0],))]
+            assets.append(asset)
+        return assets
+
+    def iter_records(self):
+        """Stream every indexed asset as a record with its absolute file and tags"""
+        cursor = self.connection.execute(
+            "SELECT file, name, type, description, license, copyright, author, GROUP_CONCAT(tag, char(31))"
+            " FROM assets LEFT JOIN tags ON tags.asset_id = assets.id GROUP BY assets.id ORDER BY file, name"
+        )
+        for row in cursor:
+            record = dict(zip(("file", "name", "type", *ASSET_METADATA_FIELDS), row))
+            record["file"] = os.path.join(self.directory, record["file"])
+            record["tags"] = row[-1].split(chr(31)) if row[-1] else []
+            yield record
+
+    def duplicate_names(self):
+        """Assets whose type and name are used in more than one library file"""
+        rows = self.connection.execute(
+            "SELECT file, type, name FROM assets WHERE (type, name) IN"
+            " (SELECT type, name FROM assets GROUP BY type, name HAVING COUNT(DISTINCT file) > 1)"
+            " ORDER BY name, file"
+        )
+        return [{"file": os.path.join(self.directory, file), "type": id_type, "name": name} for file, id_type, name in rows]
+
+    def tag_counts(self):
+        """Every tag of the library with the number of assets using it, the most used first"""
+        return self.connection.execute(
+            "SELECT tag, COUNT(*) FROM tags GROUP BY tag ORDER BY COUNT(*) DESC, tag"
+        ).fetchall()
+
+class AssetIndexResult(bpy.types.PropertyGroup):
+    """Asset found by an index query"""
+    name: bpy.props.StringProperty(name="Name")
+    file: bpy.props.StringProperty(name="File")
+    id_type: bpy.props.StringProperty(name="Type")
+
+class ASSET_OT_UpdateIndex(bpy.types.Operator):
+    """Index the assets of the library folder, only reading files that changed since the last update"""
+    bl_idname = "asset.update_index"
+    bl_label = "Update Index"
 
     def execute(self, context):
-        description_text = context.scene.asset_description
-        license_text = context.scene.asset_license
-        copyright_text = context.scene.asset_copyright
-        author_text = context.scene.asset_author
+        directory = bpy.path.abspath(context.scene.library_path)
+        if not os.path.isdir(directory):
+            self.report({'WARNING'}, "Library folder not found.")
+            return {'CANCELLED'}
 
-        assets = context.selected_assets
-        if not assets:
-            self.report({'WARNING'}, "No assets selected.")
+        with AssetIndex(directory) as index:
+            results = index.update(context.scene.library_workers)
+            asset_count = index.connection.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+        for result in results:
+            if result["error"]:
+                self.report({'WARNING'}, f"{result['file']}: {result['error']}")
+        self.report({'INFO'}, f"Indexed {len(results)} changed file(s). {asset_count} asset(s) in the index.")
+        return {'FINISHED'}
+
+class ASSET_OT_QueryIndex(bpy.types.Operator):
+    """Find assets in the library index, the results can be used by Apply to Library"""
+    bl_idname = "asset.query_index"
+    bl_label = "Find Assets"
+
+    def execute(self, context):
+        scene = context.scene
+        directory = bpy.path.abspath(scene.library_path)
+        if not os.path.isdir(directory):
+            self.report({'WARNING'}, "Library folder not found.")
             return {'CANCELLED'}
 
+        missing = "" if scene.index_query_missing == 'NONE' else scene.index_query_missing.lower()
+        with AssetIndex(directory) as index:
+            assets = index.query(scene.index_query_tag.strip(), scene.index_query_name.strip(), missing)
+
+        scene.index_results.clear()
         for asset in assets:
-            if description_text:
-                asset.metadata.description = description_text
-            if license_text:
-                asset.metadata.license = license_text
-            if copyright_text:
-                asset.metadata.copyright = copyright_text
-            if author_text:
-                asset.metadata.author = author_text
-        
-        self.report({'INFO'}, f"Updated metadata for {len(assets)} asset(s).")
+            item = scene.index_results.add()
+            item.name = asset["name"]
+            item.file = asset["file"]
+            item.id_type = asset["type"]
+
+        self.report({'INFO'}, f"Found {len(assets)} asset(s).")
         return {'FINISHED'}
+
+# Tag Vocabulary
+class TagMapping(bpy.types.PropertyGroup):
+    """Distinct tag with its usage count and the tag it should become"""
+    name: bpy.props.StringProperty(name="Tag")
+    new_tag: bpy.props.StringProperty(name="New Tag")
+    count: bpy.props.IntProperty(name="Count")
+    apply: bpy.props.BoolProperty(
+        name="Apply",
+        description="Rename this tag, typo suggestions are left unchecked until reviewed",
+        default=True
+    )
+
+def singular(word):
+    """Naive English singular of a word, good enough to group tag variants"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def tag_key(tag):
+    """Tag with case, whitespace and plural differences removed"""
+    return " ".join(singular(word) for word in tag.casefold().split())
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance of two strings, anything above the limit is returned as limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def suggest_tag_merges(tag_counts, max_distance=1, min_length=5):
+    """Suggested new tag of every tag, from (tag, usage count) pairs
+
+    Variants differing in case, whitespace or plural form are merged into their
+    most used spelling, and keys of min_length or more within max_distance edits
+    (typos) into the more used one.
+    """
+    groups = {}
+    for tag, count in tag_counts:
+        groups.setdefault(tag_key(tag), []).append((count, tag))
+
+    # Most used groups first, so typos merge into the common spelling
+    keys = sorted(groups, key=lambda key: -sum(count for count, tag in groups[key]))
+    canonical = {}
+    for index, key in enumerate(keys):
+        target = key
+        if len(key) >= min_length:
+            for other in keys[:index]:
+                if len(other) >= min_length and canonical[other] == other and edit_distance(key, other, max_distance) <= max_distance:
+                    target = other
+                    break
+        canonical[key] = target
+
+    suggestions = {}
+    for key, variants in groups.items():
+        count, spelling = max(groups[canonical[key]], key=lambda variant: (variant[0], variant[1] == variant[1].strip()))
+        for count, tag in variants:
+            suggestions[tag] = spelling.strip()
+    return suggestions
+
+def tag_mapping_pairs(scene):
+    """[old tag, new tag] pairs of the checked rows of the mapping table"""
+    return [[item.name, item.new_tag] for item in scene.tag_mappings if item.apply and item.new_tag and item.new_tag != item.name]
+
+class ASSET_UL_TagMappings(bpy.types.UIList):
+    """Tag mapping table row: apply checkbox, tag, usage count and editable new tag"""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "apply", text="")
+        row.label(text=f"{item.name} ({item.count})")
+        row.prop(item, "new_tag", text="")
+
+class ASSET_OT_CollectVocabulary(bpy.types.Operator):
+    """Collect every distinct tag with its usage count and suggest merges"""
+    bl_idname = "asset.collect_vocabulary"
+    bl_label = "Collect Tags"
+
+    def execute(self, context):
+        scene = context.scene
+        if scene.vocabulary_scope == 'LIBRARY':
+            directory = bpy.path.abspath(scene.library_path)
+            if not os.path.isdir(directory):
+                self.report({'WARNING'}, "Library folder not found.")
+                return {'CANCELLED'}
+            with AssetIndex(directory) as index:
+                tag_counts = index.tag_counts()
+        else:
+            usage = {}
+            for asset in context.selected_assets:
+                for tag in asset.metadata.tags:
+                    usage[tag.name] = usage.get(tag.name, 0) + 1
+            tag_counts = sorted(usage.items(), key=lambda item: (-item[1], item[0]))
+
+        if not tag_counts:
+            self.report({'WARNING'}, "No tags found, select assets or update the library index.")
+            return {'CANCELLED'}
+
+        suggestions = suggest_tag_merges(tag_counts)
+        scene.tag_mappings.clear()
+        for tag, count in tag_counts:
+            item = scene.tag_mappings.add()
+            item.name = tag
+            item.count = count
+            item.new_tag = suggestions[tag]
+            # Only case, whitespace and plural merges are safe, typo guesses can join unrelated tags
+            item.apply = tag_key(item.new_tag) == tag_key(tag)
+
+        merges = sum(1 for tag, new_tag in suggestions.items() if tag != new_tag)
+        self.report({'INFO'}, f"Collected {len(tag_counts)} tag(s), {merges} suggested merge(s).")
+        return {'FINISHED'}
+
+class ASSET_OT_ApplyTagMapping(TagChangesetOperator, bpy.types.Operator):
+    """Rename and merge the selected assets' tags using the whole mapping table in one pass"""
+    bl_idname = "asset.apply_tag_mapping"
+    bl_label = "Apply Tag Mapping"
+
+    def tag_operations(self, context):
+        return {"replace": tag_mapping_pairs(context.scene)}
+
+# Operators for Asset Information
+class ASSET_OT_EditMetadata(TagChangesetOperator, bpy.types.Operator):
+    """Edit Metadata of Selected Assets"""
+    bl_idname = "asset.edit_metadata"
+    bl_label = "Edit Metadata"
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+    def tag_operations(self, context):
+        scene = context.scene
+        return {"metadata": {field: getattr(scene, f"asset_{field}") for field in ASSET_METADATA_FIELDS}}
     
 class ASSET_OT_FillWithDefaultValues(bpy.types.Operator):
     """Fill All Metadata Fields with Default Values"""
@@ -185,6 +1017,784 @@ class ASSET_OT_FillWithDefaultValues(bpy.types.Operator):
         self.report({'INFO'}, "All fields are pre-filled with default values.")
         return {'FINISHED'}
 
+# Metadata Import and Export
+EXCHANGE_COLUMNS = ("file", "type", "name", "tags") + ASSET_METADATA_FIELDS
+TAG_SEPARATOR = "; "
+
+def exchange_row(file_path, record):
+    """Exchange row of an asset record"""
+    row = {"file": file_path, "type": record["type"], "name": record["name"]}
+    row["tags"] = list(record["tags"])
+    for field in ASSET_METADATA_FIELDS:
+        row[field] = record[field]
+    return row
+
+def write_exchange_file(path, rows):
+    """Write metadata rows as CSV with the tags joined in one cell, or as JSON when the path ends in .json"""
+    with open(path, "w", newline="", encoding="utf-8") as exchange_file:
+        if path.lower().endswith(".json"):
+            json.dump(list(rows), exchange_file, indent=4)
+        else:
+            writer = csv.DictWriter(exchange_file, fieldnames=EXCHANGE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(dict(row, tags=TAG_SEPARATOR.join(row["tags"])) for row in rows)
+
+def read_exchange_file(path):
+    """Yield (row number, row) of a CSV or JSON metadata file, CSV is read row by row"""
+    with open(path, newline="", encoding="utf-8-sig") as exchange_file:
+        if path.lower().endswith(".json"):
+            yield from enumerate(json.load(exchange_file), 1)
+        else:
+            # Row 1 is the header
+            yield from enumerate(csv.DictReader(exchange_file), 2)
+
+def row_operations(row):
+    """Operation set of an imported row: the exact tag set and the non-empty metadata fields
+
+    Columns missing from the file are left untouched. Tags are a list in JSON files
+    and one separated cell in CSV files, both are accepted.
+    """
+    operations = {"metadata": {field: row[field] for field in ASSET_METADATA_FIELDS if row.get(field)}}
+    for field, value in operations["metadata"].items():
+        if not isinstance(value, str):
+            raise TypeError(f"{field} must be text")
+
+    tags = row.get("tags")
+    if tags is not None:
+        if isinstance(tags, str):
+            tags = tags.split(TAG_SEPARATOR.strip())
+        elif not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise TypeError("tags must be a list of text or a separated text")
+        operations["set"] = [tag.strip() for tag in tags if tag.strip()]
+    return operations
+
+def asset_key(id_type, name):
+    return f"{id_type}:{name}"
+
+class ASSET_OT_ExportMetadata(bpy.types.Operator):
+    """Export tags and metadata of the selected assets or of the library index to a CSV or JSON file"""
+    bl_idname = "asset.export_metadata"
+    bl_label = "Export Metadata"
+
+    def execute(self, context):
+        scene = context.scene
+        path = bpy.path.abspath(scene.metadata_file)
+        if not scene.metadata_file:
+            self.report({'WARNING'}, "No metadata file chosen.")
+            return {'CANCELLED'}
+
+        if scene.metadata_scope == 'LIBRARY':
+            directory = bpy.path.abspath(scene.library_path)
+            if not os.path.isdir(directory):
+                self.report({'WARNING'}, "Library folder not found.")
+                return {'CANCELLED'}
+            with AssetIndex(directory) as index:
+                index.update(scene.library_workers)
+                rows = [exchange_row(asset["file"], asset) for asset in index.query()]
+        else:
+            rows = []
+            for asset in context.selected_assets:
+                if asset.local_id is None:
+                    continue
+                rows.append(exchange_row(bpy.data.filepath, asset_record(asset.local_id)))
+
+        write_exchange_file(path, rows)
+        self.report({'INFO'}, f"Exported {len(rows)} asset(s) to {path}.")
+        return {'FINISHED'}
+
+class ASSET_OT_ImportMetadata(bpy.types.Operator):
+    """Import tags and metadata from a CSV or JSON file, matching rows to assets by file, type and name
+
+    Rows of the open file are applied as one undo step, rows of other library files
+    by the background workers. Only fields that changed are written.
+    """
+    bl_idname = "asset.import_metadata"
+    bl_label = "Import Metadata"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scene = context.scene
+        path = bpy.path.abspath(scene.metadata_file)
+        if not os.path.isfile(path):
+            self.report({'WARNING'}, "Metadata file not found.")
+            return {'CANCELLED'}
+
+        current_file = os.path.normpath(bpy.data.filepath) if bpy.data.filepath else ""
+        local_assets = {asset_key(datablock.id_type, datablock.name): datablock for datablock in iter_local_assets()}
+        local_operations = []
+        library_operations = {}
+        row_numbers = {}
+        errors = []
+
+        try:
+            for row_number, row in read_exchange_file(path):
+                try:
+                    if not row.get("name") or not row.get("type"):
+                        errors.append(f"Row {row_number}: missing name or type")
+                        continue
+
+                    key = asset_key(row["type"], row["name"])
+                    file_path = os.path.normpath(bpy.path.abspath(row["file"])) if row.get("file") else current_file
+                    if file_path == current_file:
+                        datablock = local_assets.get(key)
+                        if datablock is None:
+                            errors.append(f"Row {row_number}: no {row['type'].lower()} asset '{row['name']}' in this file")
+                            continue
+                        local_operations.append((datablock.asset_data, row_operations(row)))
+                    elif os.path.isfile(file_path):
+                        library_operations.setdefault(file_path, {})[key] = row_operations(row)
+                        row_numbers[file_path, key] = row_number
+                    else:
+                        errors.append(f"Row {row_number}: file not found '{row['file']}'")
+                except (AttributeError, TypeError, ValueError) as error:
+                    errors.append(f"Row {row_number}: malformed row ({error})")
+        except (csv.Error, ValueError, UnicodeDecodeError) as error:
+            self.report({'ERROR'}, f"Could not read {path}: {error}")
+            return {'CANCELLED'}
+
+        changed = TagChangeset(local_operations).apply()
+
+        results = run_library_batch(
+            list(library_operations),
+            {"mode": 'EDIT', "asset_operations": library_operations},
+            scene.library_workers
+        )
+        for result in results:
+            changed += result["changed"]
+            if result["error"]:
+                errors.append(f"{result['file']}: {result['error']}")
+            for key in result.get("missing", []):
+                errors.append(f"Row {row_numbers[result['file'], key]}: asset not found in {result['file']}")
+
+        for error in errors:
+            self.report({'WARNING'}, error)
+        self.report({'INFO'}, f"Updated {changed} asset(s), {len(errors)} row(s) with errors.")
+        return {'FINISHED'}
+
+# Presets
+# Loaded presets as (path, modification time, presets, read error), read again only when the file changes
+preset_cache = {}
+
+class AssetManagerPreferences(bpy.types.AddonPreferences):
+    """Addon preferences: location of the shared preset library"""
+    bl_idname = __name__
+
+    presets_path: bpy.props.StringProperty(
+        name="Preset Library",
+        description="JSON file with the tag and metadata presets, can be shared by the team",
+        subtype='FILE_PATH'
+    )
+
+    def draw(self, context):
+        self.layout.prop(self, "presets_path")
+
+def presets_file_path():
+    """Preset library from the addon preferences, or asset_presets.json in the user config folder"""
+    addon = bpy.context.preferences.addons.get(__name__)
+    if addon is not None and addon.preferences.presets_path:
+        return bpy.path.abspath(addon.preferences.presets_path)
+    return os.path.join(bpy.utils.user_resource('CONFIG'), "asset_presets.json")
+
+def load_presets():
+    """Presets by name, as {"tags": [...], "metadata": {...}}
+
+    An unreadable preset library gives no presets, the error is kept for the operators to report.
+    """
+    path = presets_file_path()
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    if preset_cache.get("path") != path or preset_cache.get("mtime") != mtime:
+        presets = {}
+        error = None
+        if mtime is not None:
+            try:
+                with open(path) as presets_file:
+                    presets = json.load(presets_file)
+                if not isinstance(presets, dict) or not all(isinstance(preset, dict) for preset in presets.values()):
+                    raise ValueError("presets must be a JSON object of objects")
+            except (OSError, ValueError) as read_error:
+                presets = {}
+                error = f"{path}: {read_error}"
+        preset_cache.update(path=path, mtime=mtime, presets=presets, error=error)
+    return preset_cache["presets"]
+
+def report_preset_error(operator):
+    """Report an unreadable preset library, return True when the operator has to stop"""
+    load_presets()
+    error = preset_cache.get("error")
+    if error is not None:
+        operator.report({'ERROR'}, f"Could not read the preset library: {error}")
+    return error is not None
+
+def save_presets(presets):
+    path = presets_file_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as presets_file:
+        json.dump(presets, presets_file, indent=4, sort_keys=True)
+    preset_cache.update(path=path, mtime=os.path.getmtime(path), presets=presets, error=None)
+
+def preset_operations(preset):
+    """Operation set applying a preset: add its tags and fill its metadata"""
+    return {"add": preset.get("tags", []), "metadata": preset.get("metadata", {})}
+
+# Enum items must stay referenced while Blender uses them
+preset_items = []
+
+def preset_enum_items(self, context):
+    preset_items[:] = [(name, name, "") for name in sorted(load_presets())]
+    return preset_items or [('NONE', "No Presets", "")]
+
+class ASSET_OT_SavePreset(bpy.types.Operator):
+    """Save the tag list and metadata fields as a named preset in the preset library"""
+    bl_idname = "asset.save_preset"
+    bl_label = "Save Preset"
+
+    def execute(self, context):
+        scene = context.scene
+        name = scene.preset_name.strip()
+        if not name:
+            self.report({'WARNING'}, "Preset name is empty.")
+            return {'CANCELLED'}
+        # Saving over an unreadable library would lose the presets of the whole team
+        if report_preset_error(self):
+            return {'CANCELLED'}
+
+        presets = dict(load_presets())
+        presets[name] = {
+            "tags": [item.name for item in scene.tag_list],
+            "metadata": {field: getattr(scene, f"asset_{field}") for field in ASSET_METADATA_FIELDS},
+        }
+        save_presets(presets)
+        scene.asset_preset = name
+        self.report({'INFO'}, f"Saved preset '{name}'.")
+        return {'FINISHED'}
+
+class ASSET_OT_LoadPreset(bpy.types.Operator):
+    """Fill the tag list and metadata fields from the chosen preset"""
+    bl_idname = "asset.load_preset"
+    bl_label = "Load Preset"
+
+    def execute(self, context):
+        scene = context.scene
+        if report_preset_error(self):
+            return {'CANCELLED'}
+        preset = load_presets().get(scene.asset_preset)
+        if preset is None:
+            self.report({'WARNING'}, "No preset chosen.")
+            return {'CANCELLED'}
+
+        scene.tag_list.clear()
+        for tag in preset.get("tags", []):
+            item = scene.tag_list.add()
+            item.name = tag
+        for field in ASSET_METADATA_FIELDS:
+            setattr(scene, f"asset_{field}", preset.get("metadata", {}).get(field, ""))
+
+        self.report({'INFO'}, f"Loaded preset '{scene.asset_preset}'.")
+        return {'FINISHED'}
+
+class ASSET_OT_DeletePreset(bpy.types.Operator):
+    """Delete the chosen preset from the preset library"""
+    bl_idname = "asset.delete_preset"
+    bl_label = "Delete Preset"
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        if report_preset_error(self):
+            return {'CANCELLED'}
+        presets = dict(load_presets())
+        if presets.pop(context.scene.asset_preset, None) is None:
+            self.report({'WARNING'}, "No preset chosen.")
+            return {'CANCELLED'}
+
+        save_presets(presets)
+        self.report({'INFO'}, "Deleted preset.")
+        return {'FINISHED'}
+
+class ASSET_OT_ApplyPreset(TagChangesetOperator, bpy.types.Operator):
+    """Add the chosen preset's tags and fill its metadata on the selected assets in one step"""
+    bl_idname = "asset.apply_preset"
+    bl_label = "Apply Preset"
+
+    def tag_operations(self, context):
+        return preset_operations(load_presets().get(context.scene.asset_preset, {}))
+
+    def invoke(self, context, event):
+        if report_preset_error(self):
+            return {'CANCELLED'}
+        return super().invoke(context, event)
+
+    def execute(self, context):
+        if report_preset_error(self):
+            return {'CANCELLED'}
+        return super().execute(context)
+
+# Asset Previews
+CAMERA_DIRECTION = Vector((1.0, -1.0, 0.7)).normalized()
+# Studio lights used when the file has no lights_all collection: name, direction, relative energy
+STUDIO_LIGHTS = (
+    ("PreviewKey", (1.0, -1.0, 1.2), 1.0),
+    ("PreviewFill", (-1.2, -0.6, 0.5), 0.35),
+    ("PreviewRim", (0.0, 1.4, 1.0), 0.6),
+)
+
+def hash_object(hasher, obj):
+    hasher.update(f"{obj.name}:{obj.type}:{tuple(map(tuple, obj.matrix_world))}".encode())
+    if obj.type == 'MESH':
+        coordinates = array.array('f', [0.0]) * (len(obj.data.vertices) * 3)
+        obj.data.vertices.foreach_get("co", coordinates)
+        hasher.update(coordinates.tobytes())
+        hasher.update(f"{len(obj.data.polygons)}".encode())
+    for modifier in obj.modifiers:
+        hasher.update(f"{modifier.type}:{modifier.show_render}".encode())
+    for slot in obj.material_slots:
+        if slot.material is not None:
+            hash_material(hasher, slot.material)
+
+def hash_material(hasher, material):
+    hasher.update(f"{material.name}:{tuple(material.diffuse_color)}".encode())
+    if material.node_tree is not None:
+        for node in sorted(material.node_tree.nodes, key=lambda node: node.name):
+            hasher.update(f"{node.name}:{node.bl_idname}".encode())
+            for socket in node.inputs:
+                value = getattr(socket, "default_value", None)
+                if value is not None and not isinstance(value, (bool, int, float, str)):
+                    value = tuple(value) if hasattr(value, "__len__") else None
+                hasher.update(f"{socket.identifier}={value}:{socket.is_linked}".encode())
+
+def asset_content_hash(datablock, settings):
+    """Hash of everything shown in the preview of an asset, with the studio lights and preview size"""
+    hasher = hashlib.sha1(f"{datablock.id_type}:{datablock.name}:{settings['size']}".encode())
+    if isinstance(datablock, bpy.types.Material):
+        hash_material(hasher, datablock)
+    for obj in sorted(asset_objects(datablock), key=lambda obj: obj.name):
+        hash_object(hasher, obj)
+
+    lights = bpy.data.collections.get("lights_all")
+    if lights is not None:
+        for obj in sorted(lights.all_objects, key=lambda obj: obj.name):
+            hash_object(hasher, obj)
+    return hasher.hexdigest()
+
+def load_custom_preview(datablock, image_path):
+    with bpy.context.temp_override(id=datablock):
+        bpy.ops.ed.lib_id_load_custom_preview(filepath=image_path)
+
+class PreviewStudio:
+    """Scene with a consistent camera and lighting the asset previews are rendered in
+
+    Uses the file's lights_all collection when it has one, like the collection renders,
+    otherwise three area lights around the asset. Object, collection and material
+    assets (on a sphere) get previews.
+    """
+    def __init__(self, settings):
+        self.settings = settings
+        self.scene = bpy.data.scenes.new("AssetPreviewStudio")
+        render = self.scene.render
+        render.resolution_x = render.resolution_y = settings["size"]
+        render.resolution_percentage = 100
+        render.film_transparent = True
+        render.image_settings.file_format = 'PNG'
+        render.image_settings.color_mode = 'RGBA'
+
+        self.objects = []
+        self.camera = self.add_object("AssetPreviewCamera", bpy.data.cameras.new("AssetPreviewCamera"))
+        self.scene.camera = self.camera
+
+        self.lights = []
+        lights_all = bpy.data.collections.get("lights_all")
+        if lights_all is not None:
+            self.scene.collection.children.link(lights_all)
+        else:
+            for name, direction, energy in STUDIO_LIGHTS:
+                light_data = bpy.data.lights.new(name, 'AREA')
+                light_data.size = 2.0
+                self.lights.append((self.add_object(name, light_data), Vector(direction).normalized(), energy))
+
+        mesh = bpy.data.meshes.new("AssetPreviewSphere")
+        sphere = bmesh.new()
+        bmesh.ops.create_uvsphere(sphere, u_segments=48, v_segments=24, radius=1.0)
+        sphere.to_mesh(mesh)
+        sphere.free()
+        for polygon in mesh.polygons:
+            polygon.use_smooth = True
+        self.sphere = bpy.data.objects.new("AssetPreviewSphere", mesh)
+        self.objects.append(self.sphere)
+
+    def add_object(self, name, data):
+        obj = bpy.data.objects.new(name, data)
+        self.scene.collection.objects.link(obj)
+        self.objects.append(obj)
+        return obj
+
+    def frame(self, objects):
+        """Aim the camera and the studio lights at the bounding sphere of the objects"""
+        corners = [obj.matrix_world @ Vector(corner) for obj in objects for corner in obj.bound_box]
+        low = Vector([min(corner[axis] for corner in corners) for axis in range(3)])
+        high = Vector([max(corner[axis] for corner in corners) for axis in range(3)])
+        center = (low + high) / 2
+        radius = max((high - low).length / 2, 0.001)
+
+        distance = radius / math.sin(self.camera.data.angle / 2) * 1.05
+        self.camera.location = center + CAMERA_DIRECTION * distance
+        self.camera.rotation_euler = (-CAMERA_DIRECTION).to_track_quat('-Z', 'Y').to_euler()
+        self.camera.data.clip_start = distance / 1000
+        self.camera.data.clip_end = distance + radius * 2
+
+        for light, direction, energy in self.lights:
+            light.location = center + direction * distance
+            light.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+            light.data.size = radius * 2
+            light.data.energy = energy * 100 * distance ** 2
+
+    def render(self, datablock, image_path):
+        """Render a preview image of an asset, return False for asset types without previews"""
+        linked = []
+        if isinstance(datablock, bpy.types.Material):
+            self.sphere.active_material = datablock
+            objects = [self.sphere]
+        else:
+            objects = asset_objects(datablock)
+            if not objects:
+                return False
+        for obj in objects:
+            if self.scene.collection.objects.get(obj.name) is None:
+                self.scene.collection.objects.link(obj)
+                linked.append(obj)
+
+        try:
+            self.frame(objects)
+            self.scene.render.filepath = image_path
+            bpy.ops.render.render(write_still=True, scene=self.scene.name)
+        finally:
+            for obj in linked:
+                self.scene.collection.objects.unlink(obj)
+        return True
+
+    def update_preview(self, datablock, result):
+        """Regenerate the preview of an asset whose content changed, return True if it was rendered
+
+        With "apply" the preview is loaded into the asset, otherwise the image is
+        listed in the result for the file's owner to load.
+        """
+        content_hash = asset_content_hash(datablock, self.settings)
+        if not self.settings["force"] and datablock.get("preview_hash") == content_hash:
+            return False
+
+        image_path = os.path.join(self.settings["output_dir"], f"{content_hash}.png")
+        if not self.render(datablock, image_path):
+            return False
+
+        if self.settings["apply"]:
+            load_custom_preview(datablock, image_path)
+            datablock["preview_hash"] = content_hash
+        else:
+            result["previews"].append({
+                "type": datablock.id_type, "name": datablock.name,
+                "image": image_path, "hash": content_hash,
+            })
+        return True
+
+    def remove(self):
+        """Remove the studio from the file before it is saved"""
+        bpy.data.scenes.remove(self.scene)
+        for obj in self.objects:
+            data = obj.data
+            bpy.data.objects.remove(obj)
+            if isinstance(data, bpy.types.Camera):
+                bpy.data.cameras.remove(data)
+            elif isinstance(data, bpy.types.Light):
+                bpy.data.lights.remove(data)
+            elif isinstance(data, bpy.types.Mesh):
+                bpy.data.meshes.remove(data)
+
+class ASSET_OT_RegeneratePreviews(bpy.types.Operator):
+    """Render new previews of the selected assets or of a whole library in background workers
+
+    Only assets whose content changed since their last generated preview are rendered.
+    """
+    bl_idname = "asset.regenerate_previews"
+    bl_label = "Regenerate Previews"
+
+    def execute(self, context):
+        # Previews are copied into the files once loaded, the rendered images are not kept
+        output_dir = tempfile.mkdtemp(prefix="asset_previews_")
+        try:
+            return self.regenerate(context, output_dir)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def regenerate(self, context, output_dir):
+        scene = context.scene
+        settings = {
+            "size": scene.preview_size,
+            "force": scene.preview_force,
+            "output_dir": output_dir,
+        }
+
+        if scene.preview_scope == 'LIBRARY':
+            directory = bpy.path.abspath(scene.library_path)
+            if not os.path.isdir(directory):
+                self.report({'WARNING'}, "Library folder not found.")
+                return {'CANCELLED'}
+            settings["apply"] = True
+            results = run_library_batch(
+                find_blend_files(directory), {"mode": 'PREVIEW', "preview": settings}, scene.library_workers
+            )
+        else:
+            # Workers render the saved file, its assets are split between them
+            if not bpy.data.filepath or bpy.data.is_dirty:
+                self.report({'WARNING'}, "Save the file first, previews are rendered from the saved file.")
+                return {'CANCELLED'}
+            local_assets = {
+                asset_key(asset.local_id.id_type, asset.local_id.name): asset.local_id
+                for asset in context.selected_assets if asset.local_id is not None
+            }
+            if not local_assets:
+                self.report({'WARNING'}, "No local assets selected.")
+                return {'CANCELLED'}
+
+            settings["apply"] = False
+            selection = [[datablock.id_type, datablock.name] for datablock in local_assets.values()]
+            worker_count = max(1, min(scene.library_workers, len(selection)))
+            jobs = [{
+                "mode": 'PREVIEW', "preview": settings, "save": False,
+                "files": [bpy.data.filepath],
+                "assets": {bpy.data.filepath: selection[worker_index::worker_count]},
+            } for worker_index in range(worker_count)]
+            results = run_library_jobs(jobs)
+
+            for result in results:
+                for preview in result.get("previews", []):
+                    datablock = local_assets[asset_key(preview["type"], preview["name"])]
+                    load_custom_preview(datablock, preview["image"])
+                    datablock["preview_hash"] = preview["hash"]
+
+        rendered = 0
+        for result in results:
+            rendered += result["changed"]
+            if result["error"]:
+                self.report({'WARNING'}, f"{result['file']}: {result['error']}")
+        self.report({'INFO'}, f"Regenerated {rendered} preview(s), other assets were up to date.")
+        return {'FINISHED'}
+
+# Library Validation
+VALIDATION_RULES = (
+    ('NO_TAGS', "No tags"),
+    ('NO_DESCRIPTION', "Empty description"),
+    ('NO_LICENSE', "Empty license"),
+    ('NO_COPYRIGHT', "Empty copyright"),
+    ('NO_AUTHOR', "Empty author"),
+    ('UNAPPROVED_TAGS', "Tags outside the vocabulary"),
+    ('DUPLICATE_NAME', "Name used in several files"),
+)
+MAX_LISTED_OFFENDERS = 5
+
+# Offenders of the last validation by rule, with the scope it ran on
+validation_report = {"scope": None, "offenders": {}}
+
+class ValidationRules(bpy.types.PropertyGroup):
+    """Rules the assets of a library are validated against"""
+    require_tags: bpy.props.BoolProperty(name="Tags", default=True)
+    require_description: bpy.props.BoolProperty(name="Description", default=False)
+    require_license: bpy.props.BoolProperty(name="License", default=True)
+    require_copyright: bpy.props.BoolProperty(name="Copyright", default=False)
+    require_author: bpy.props.BoolProperty(name="Author", default=True)
+    approved_tags_path: bpy.props.StringProperty(
+        name="Approved Tags",
+        description="Text file with one approved tag per line, every tag is allowed when empty",
+        subtype='FILE_PATH'
+    )
+    unique_names: bpy.props.BoolProperty(
+        name="Unique Names",
+        description="Report asset names used in several library files",
+        default=True
+    )
+
+class ValidationIssue(bpy.types.PropertyGroup):
+    """Rule of the last validation with its number of offenders"""
+    name: bpy.props.StringProperty(name="Rule")
+    label: bpy.props.StringProperty(name="Label")
+    count: bpy.props.IntProperty(name="Count")
+    examples: bpy.props.StringProperty(name="Examples")
+
+def load_approved_tags(path):
+    if not path:
+        return None
+    with open(bpy.path.abspath(path), encoding="utf-8") as tags_file:
+        return {line.strip() for line in tags_file if line.strip()}
+
+class AssetValidator:
+    """Checks asset records one by one, keeping the offenders of every rule"""
+    def __init__(self, rules):
+        self.rules = rules
+        self.approved_tags = load_approved_tags(rules.approved_tags_path)
+        self.offenders = {rule: [] for rule, label in VALIDATION_RULES}
+        self.checked = 0
+
+    def check(self, record):
+        self.checked += 1
+        offender = {"file": record["file"], "type": record["type"], "name": record["name"]}
+
+        if self.rules.require_tags and not record["tags"]:
+            self.offenders['NO_TAGS'].append(offender)
+        for field in ASSET_METADATA_FIELDS:
+            if getattr(self.rules, f"require_{field}") and not record[field]:
+                self.offenders[f"NO_{field.upper()}"].append(offender)
+        if self.approved_tags is not None:
+            unapproved = [tag for tag in record["tags"] if tag not in self.approved_tags]
+            if unapproved:
+                self.offenders['UNAPPROVED_TAGS'].append(dict(offender, tags=unapproved))
+
+    def report(self):
+        """Counts and offender lists by rule"""
+        return {
+            "checked": self.checked,
+            "rules": {rule: {"count": len(offenders), "offenders": offenders} for rule, offenders in self.offenders.items()},
+        }
+
+@bpy.app.handlers.persistent
+def clear_validation_report(dummy):
+    """Forget the last validation, its offenders are not saved with the file"""
+    validation_report["scope"] = None
+    validation_report["offenders"] = {}
+    for scene in bpy.data.scenes:
+        scene.validation_issues.clear()
+
+def offender_label(offender):
+    return f"{offender['name']} ({os.path.basename(offender['file'])})"
+
+def issue_operations(scene, rule, offender):
+    """Operation set fixing an issue of an asset, None when the rule has no automatic fix"""
+    if rule == 'NO_TAGS':
+        return {"add": [item.name for item in scene.tag_list]} if len(scene.tag_list) else None
+    if rule == 'UNAPPROVED_TAGS':
+        return {"remove": offender["tags"]}
+    if rule.startswith("NO_"):
+        field = rule[3:].lower()
+        value = getattr(scene, f"asset_{field}")
+        return {"metadata": {field: value}} if value else None
+    return None
+
+class ASSET_OT_ValidateAssets(bpy.types.Operator):
+    """Validate the selected assets or the whole library and report the assets breaking the rules"""
+    bl_idname = "asset.validate_assets"
+    bl_label = "Validate Assets"
+
+    def execute(self, context):
+        scene = context.scene
+        try:
+            validator = AssetValidator(scene.validation_rules)
+        except OSError as error:
+            self.report({'WARNING'}, f"Could not read the approved tags: {error}")
+            return {'CANCELLED'}
+
+        if scene.validation_scope == 'LIBRARY':
+            directory = bpy.path.abspath(scene.library_path)
+            if not os.path.isdir(directory):
+                self.report({'WARNING'}, "Library folder not found.")
+                return {'CANCELLED'}
+
+            # Workers index changed files one by one, records are then streamed from the index
+            with AssetIndex(directory) as index:
+                for result in index.update(scene.library_workers):
+                    if result["error"]:
+                        self.report({'WARNING'}, f"{result['file']}: {result['error']}")
+                for record in index.iter_records():
+                    validator.check(record)
+                if scene.validation_rules.unique_names:
+                    validator.offenders['DUPLICATE_NAME'] = index.duplicate_names()
+
+            report = validator.report()
+            report_path = os.path.join(directory, "asset_health_report.json")
+            with open(report_path, "w") as report_file:
+                json.dump(report, report_file, indent=4)
+        else:
+            for asset in context.selected_assets:
+                if asset.local_id is not None:
+                    validator.check(dict(asset_record(asset.local_id), file=bpy.data.filepath))
+            report = validator.report()
+
+        validation_report["scope"] = scene.validation_scope
+        validation_report["offenders"] = validator.offenders
+        scene.validation_issues.clear()
+        issue_count = 0
+        for rule, label in VALIDATION_RULES:
+            offenders = report["rules"][rule]["offenders"]
+            if not offenders:
+                continue
+            issue = scene.validation_issues.add()
+            issue.name = rule
+            issue.label = label
+            issue.count = len(offenders)
+            issue.examples = ", ".join(offender_label(offender) for offender in offenders[:MAX_LISTED_OFFENDERS])
+            issue_count += len(offenders)
+
+        self.report({'INFO'}, f"Checked {report['checked']} asset(s), found {issue_count} issue(s).")
+        return {'FINISHED'}
+
+class ASSET_OT_SelectValidationIssue(bpy.types.Operator):
+    """Put the assets breaking a rule into the index results, for the library batch operations"""
+    bl_idname = "asset.select_validation_issue"
+    bl_label = "Select Offenders"
+
+    rule: bpy.props.StringProperty()
+
+    def execute(self, context):
+        offenders = validation_report["offenders"].get(self.rule, [])
+        context.scene.index_results.clear()
+        for offender in offenders:
+            item = context.scene.index_results.add()
+            item.name = offender["name"]
+            item.file = offender["file"]
+            item.id_type = offender["type"]
+
+        self.report({'INFO'}, f"Selected {len(offenders)} asset(s) in the index results.")
+        return {'FINISHED'}
+
+class ASSET_OT_FixValidationIssue(bpy.types.Operator):
+    """Fix the assets breaking a rule: add the listed tags, fill the metadata field or remove unapproved tags"""
+    bl_idname = "asset.fix_validation_issue"
+    bl_label = "Fix Issue"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    rule: bpy.props.StringProperty()
+
+    def execute(self, context):
+        scene = context.scene
+        local_assets = {asset_key(datablock.id_type, datablock.name): datablock for datablock in iter_local_assets()}
+        local_operations = []
+        library_operations = {}
+        for offender in validation_report["offenders"].get(self.rule, []):
+            operations = issue_operations(scene, self.rule, offender)
+            if operations is None:
+                self.report({'WARNING'}, "Fill the tag list or the metadata field used by this fix first.")
+                return {'CANCELLED'}
+
+            key = asset_key(offender["type"], offender["name"])
+            if validation_report["scope"] == 'LIBRARY':
+                library_operations.setdefault(offender["file"], {})[key] = operations
+            else:
+                datablock = local_assets.get(key)
+                if datablock is not None:
+                    local_operations.append((datablock.asset_data, operations))
+
+        changed = TagChangeset(local_operations).apply()
+        results = run_library_batch(
+            list(library_operations),
+            {"mode": 'EDIT', "asset_operations": library_operations},
+            scene.library_workers
+        )
+        for result in results:
+            changed += result["changed"]
+            if result["error"]:
+                self.report({'WARNING'}, f"{result['file']}: {result['error']}")
+
+        bpy.ops.asset.validate_assets()
+        self.report({'INFO'}, f"Fixed {changed} asset(s).")
+        return {'FINISHED'}
+
 # Panels
 class ASSET_PT_TagManagerPanel(bpy.types.Panel):
     """UI Panel for Batch Tagging"""
@@ -223,6 +1833,58 @@ class ASSET_PT_TagManagerPanel(bpy.types.Panel):
         row.prop(context.scene, "new_tag", text="New Tag")
         col.operator("asset.replace_tag", text="Replace Tag")
 
+class ASSET_PT_AutoTagPanel(bpy.types.Panel):
+    """UI Panel for Rule-Based Tagging"""
+    bl_idname = "ASSET_PT_AutoTag"
+    bl_label = "Auto Tagging"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+        rules = context.scene.auto_tag_rules
+
+        col.prop(rules, "name_tokens")
+        col.prop(rules, "ignored_tokens", text="Ignore")
+        col.prop(rules, "collections")
+        col.prop(rules, "materials")
+        col.prop(rules, "polycount")
+        row = col.row(align=True)
+        row.prop(rules, "lowpoly_limit")
+        row.prop(rules, "highpoly_limit")
+        col.prop(rules, "dimensions")
+        row = col.row(align=True)
+        row.prop(rules, "small_size")
+        row.prop(rules, "large_size")
+        row = col.row(align=True)
+        row.prop(rules, "rigs")
+        row.prop(rules, "modifiers")
+
+        col.operator("asset.auto_tag", text="Auto Tag Selected Assets", icon="TAG")
+
+class ASSET_PT_VocabularyPanel(bpy.types.Panel):
+    """UI Panel for Normalizing the Tag Vocabulary"""
+    bl_idname = "ASSET_PT_Vocabulary"
+    bl_label = "Tag Vocabulary"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        row = col.row(align=True)
+        row.prop(context.scene, "vocabulary_scope", expand=True)
+        col.operator("asset.collect_vocabulary", text="Collect Tags", icon="SORTALPHA")
+        col.template_list("ASSET_UL_TagMappings", "tag_mappings", context.scene, "tag_mappings", context.scene, "tag_mappings_index")
+        col.operator("asset.apply_tag_mapping", text="Apply Mapping to Selected Assets")
+        col.label(text="Use 'Apply Tag Mapping' in Library Batch for the whole library.")
+
 class ASSET_PT_MetadataManagerPanel(bpy.types.Panel):
     """UI Panel for Editing Asset Metadata"""
     bl_idname = "ASSET_PT_MetadataManager"
@@ -236,6 +1898,18 @@ class ASSET_PT_MetadataManagerPanel(bpy.types.Panel):
         layout = self.layout
         col = layout.column()
 
+        # Presets
+        col.label(text="Preset:")
+        row = col.row(align=True)
+        row.prop(context.scene, "asset_preset", text="")
+        row.operator("asset.load_preset", text="", icon="IMPORT")
+        row.operator("asset.delete_preset", text="", icon="TRASH")
+        row = col.row(align=True)
+        row.prop(context.scene, "preset_name", text="")
+        row.operator("asset.save_preset", text="", icon="FILE_TICK")
+        col.operator("asset.apply_preset", text="Apply Preset to Assets")
+        col.separator()
+
         col.label(text="Edit Asset Metadata:")
         col.prop(context.scene, "asset_description", text="Description")
         col.prop(context.scene, "asset_license", text="License")
@@ -244,8 +1918,126 @@ class ASSET_PT_MetadataManagerPanel(bpy.types.Panel):
         col.operator("asset.fill_default", text="Fill Default")
         col.operator("asset.edit_metadata", text="Apply Metadata")
 
+class ASSET_PT_PreviewPanel(bpy.types.Panel):
+    """UI Panel for Regenerating Asset Previews"""
+    bl_idname = "ASSET_PT_Preview"
+    bl_label = "Asset Previews"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        row = col.row(align=True)
+        row.prop(context.scene, "preview_scope", expand=True)
+        col.prop(context.scene, "preview_size")
+        col.prop(context.scene, "preview_force")
+        col.operator("asset.regenerate_previews", text="Regenerate Previews", icon="RENDER_STILL")
+
+class ASSET_PT_MetadataExchangePanel(bpy.types.Panel):
+    """UI Panel for Importing and Exporting Asset Metadata"""
+    bl_idname = "ASSET_PT_MetadataExchange"
+    bl_label = "Metadata Import/Export"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(context.scene, "metadata_file", text="")
+        row = col.row(align=True)
+        row.prop(context.scene, "metadata_scope", expand=True)
+        row = col.row(align=True)
+        row.operator("asset.export_metadata", text="Export", icon="EXPORT")
+        row.operator("asset.import_metadata", text="Import", icon="IMPORT")
+
+class ASSET_PT_ValidationPanel(bpy.types.Panel):
+    """UI Panel for Validating the Asset Library"""
+    bl_idname = "ASSET_PT_Validation"
+    bl_label = "Library Validation"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+        rules = context.scene.validation_rules
+
+        col.label(text="Required:")
+        row = col.row(align=True)
+        row.prop(rules, "require_tags", toggle=True)
+        row.prop(rules, "require_description", toggle=True)
+        row.prop(rules, "require_license", toggle=True)
+        row = col.row(align=True)
+        row.prop(rules, "require_copyright", toggle=True)
+        row.prop(rules, "require_author", toggle=True)
+        row.prop(rules, "unique_names", toggle=True)
+        col.prop(rules, "approved_tags_path", text="Vocabulary")
+        row = col.row(align=True)
+        row.prop(context.scene, "validation_scope", expand=True)
+        col.operator("asset.validate_assets", text="Validate", icon="CHECKMARK")
+
+        # Report
+        for issue in context.scene.validation_issues:
+            box = col.box()
+            row = box.row(align=True)
+            row.label(text=f"{issue.label}: {issue.count}", icon="ERROR")
+            row.enabled = bool(validation_report["offenders"].get(issue.name))
+            if validation_report["scope"] == 'LIBRARY':
+                row.operator("asset.select_validation_issue", text="", icon="RESTRICT_SELECT_OFF").rule = issue.name
+            if issue.name != 'DUPLICATE_NAME':
+                row.operator("asset.fix_validation_issue", text="", icon="TOOL_SETTINGS").rule = issue.name
+            box.label(text=issue.examples)
+
+class ASSET_PT_LibraryBatchPanel(bpy.types.Panel):
+    """UI Panel for Batch Editing a Whole Asset Library"""
+    bl_idname = "ASSET_PT_LibraryBatch"
+    bl_label = "Library Batch"
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_category = "Tagging"
+    bl_context = "asset"
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(context.scene, "library_path", text="")
+        col.prop(context.scene, "library_workers")
+
+        # Index Queries
+        col.separator()
+        col.operator("asset.update_index", text="Update Index", icon="FILE_REFRESH")
+        col.prop(context.scene, "index_query_tag", text="Tag")
+        col.prop(context.scene, "index_query_name", text="Name")
+        col.prop(context.scene, "index_query_missing", text="Missing")
+        col.operator("asset.query_index", text="Find Assets", icon="VIEWZOOM")
+        col.label(text=f"Results: {len(context.scene.index_results)}")
+        col.template_list("UI_UL_list", "index_results", context.scene, "index_results", context.scene, "index_results_index")
+
+        # Batch Editing
+        col.separator()
+        col.prop(context.scene, "library_operation", text="")
+        row = col.row(align=True)
+        row.prop(context.scene, "library_scope", expand=True)
+        col.operator("asset.batch_library", text="Apply to Library")
+
 # Registration
 def register():
+    bpy.utils.register_class(AssetIndexResult)
+    bpy.utils.register_class(AutoTagRules)
+    bpy.utils.register_class(TagMapping)
+    bpy.utils.register_class(ValidationRules)
+    bpy.utils.register_class(ValidationIssue)
+
     bpy.types.Scene.tag_input = bpy.props.StringProperty(name="Tag Input")
     bpy.types.Scene.tag_list = bpy.props.CollectionProperty(type=bpy.types.PropertyGroup)
     bpy.types.Scene.tag_list_index = bpy.props.IntProperty(name="Tag List Index", default=0)
@@ -257,10 +2049,115 @@ def register():
         default=False
     )
 
+    bpy.types.Scene.auto_tag_rules = bpy.props.PointerProperty(type=AutoTagRules)
+    bpy.types.Scene.vocabulary_scope = bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ('SELECTED', "Selected Assets", "Tags of the selected assets"),
+            ('LIBRARY', "Library", "Tags of the library index"),
+        ],
+        default='SELECTED'
+    )
+    bpy.types.Scene.tag_mappings = bpy.props.CollectionProperty(type=TagMapping)
+    bpy.types.Scene.tag_mappings_index = bpy.props.IntProperty(name="Tag Mappings Index", default=0)
+
     bpy.types.Scene.asset_description = bpy.props.StringProperty(name="Description")
     bpy.types.Scene.asset_license = bpy.props.StringProperty(name="License")
     bpy.types.Scene.asset_copyright = bpy.props.StringProperty(name="Copyright")
     bpy.types.Scene.asset_author = bpy.props.StringProperty(name="Author")
+    bpy.types.Scene.asset_preset = bpy.props.EnumProperty(name="Preset", items=preset_enum_items)
+    bpy.types.Scene.preset_name = bpy.props.StringProperty(name="Preset Name")
+    bpy.types.Scene.preview_scope = bpy.props.EnumProperty(
+        name="Preview Scope",
+        items=[
+            ('SELECTED', "Selected Assets", "Regenerate previews of the selected assets of this file"),
+            ('LIBRARY', "Library", "Regenerate previews of every asset of the library folder"),
+        ],
+        default='SELECTED'
+    )
+    bpy.types.Scene.preview_size = bpy.props.IntProperty(
+        name="Preview Size",
+        description="Resolution of the rendered previews in pixels",
+        default=256,
+        min=64,
+        max=1024
+    )
+    bpy.types.Scene.preview_force = bpy.props.BoolProperty(
+        name="Regenerate Unchanged",
+        description="Render previews even when the asset didn't change since its last preview",
+        default=False
+    )
+    bpy.types.Scene.metadata_file = bpy.props.StringProperty(
+        name="Metadata File",
+        description="CSV or JSON file of asset tags and metadata",
+        subtype='FILE_PATH'
+    )
+    bpy.types.Scene.metadata_scope = bpy.props.EnumProperty(
+        name="Export Scope",
+        items=[
+            ('SELECTED', "Selected Assets", "Export the selected assets of this file"),
+            ('LIBRARY', "Library", "Export every asset of the library folder"),
+        ],
+        default='SELECTED'
+    )
+
+    bpy.types.Scene.library_path = bpy.props.StringProperty(name="Library Folder", subtype='DIR_PATH')
+    bpy.types.Scene.library_operation = bpy.props.EnumProperty(
+        name="Operation",
+        items=[
+            ('ADD', "Add Listed Tags", "Add all tags in the list"),
+            ('REMOVE', "Remove Listed Tags", "Remove all tags in the list"),
+            ('REPLACE', "Replace Tag", "Replace the old tag with the new tag"),
+            ('MAPPING', "Apply Tag Mapping", "Rename and merge tags using the vocabulary mapping table"),
+            ('METADATA', "Apply Metadata", "Apply the filled metadata fields"),
+            ('PRESET', "Apply Preset", "Add the chosen preset's tags and fill its metadata"),
+        ],
+        default='ADD'
+    )
+    bpy.types.Scene.library_scope = bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ('ALL', "All Assets", "Every asset in the library folder"),
+            ('RESULTS', "Found Assets", "Only the assets found by the last index query"),
+        ],
+        default='ALL'
+    )
+    bpy.types.Scene.index_query_tag = bpy.props.StringProperty(name="Tag")
+    bpy.types.Scene.index_query_name = bpy.props.StringProperty(
+        name="Name",
+        description="Name pattern, * matches anything"
+    )
+    bpy.types.Scene.index_query_missing = bpy.props.EnumProperty(
+        name="Missing",
+        items=[
+            ('NONE', "Anything", "Don't filter on empty fields"),
+            ('TAGS', "No Tags", "Assets without tags"),
+            ('DESCRIPTION', "No Description", "Assets without a description"),
+            ('LICENSE', "No License", "Assets without a license"),
+            ('COPYRIGHT', "No Copyright", "Assets without a copyright"),
+            ('AUTHOR', "No Author", "Assets without an author"),
+        ],
+        default='NONE'
+    )
+    bpy.types.Scene.index_results = bpy.props.CollectionProperty(type=AssetIndexResult)
+    bpy.types.Scene.index_results_index = bpy.props.IntProperty(name="Index Results Index", default=0)
+    bpy.types.Scene.validation_rules = bpy.props.PointerProperty(type=ValidationRules)
+    bpy.types.Scene.validation_scope = bpy.props.EnumProperty(
+        name="Validation Scope",
+        items=[
+            ('SELECTED', "Selected Assets", "Validate the selected assets of this file"),
+            ('LIBRARY', "Library", "Validate every asset of the library folder"),
+        ],
+        default='LIBRARY'
+    )
+    bpy.types.Scene.validation_issues = bpy.props.CollectionProperty(type=ValidationIssue)
+    bpy.types.Scene.library_workers = bpy.props.IntProperty(
+        name="Workers",
+        description="Number of background Blender processes editing files in parallel",
+        default=4,
+        min=1,
+        max=64
+    )
 
     bpy.utils.register_class(ASSET_OT_AddTagToList)
     bpy.utils.register_class(ASSET_OT_RemoveTagFromList)
@@ -270,9 +2167,42 @@ def register():
     bpy.utils.register_class(ASSET_OT_ReplaceTag)
     bpy.utils.register_class(ASSET_PT_TagManagerPanel)
 
+    bpy.utils.register_class(ASSET_OT_AutoTag)
+    bpy.utils.register_class(ASSET_PT_AutoTagPanel)
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_auto_tags)
+    bpy.app.handlers.load_post.append(reset_auto_tags)
+    bpy.app.handlers.undo_post.append(clear_auto_tags)
+    bpy.app.handlers.redo_post.append(clear_auto_tags)
+    subscribe_auto_tag_renames()
+    bpy.app.handlers.load_post.append(clear_validation_report)
+
+    bpy.utils.register_class(ASSET_UL_TagMappings)
+    bpy.utils.register_class(ASSET_OT_CollectVocabulary)
+    bpy.utils.register_class(ASSET_OT_ApplyTagMapping)
+    bpy.utils.register_class(ASSET_PT_VocabularyPanel)
+
     bpy.utils.register_class(ASSET_OT_EditMetadata)
     bpy.utils.register_class(ASSET_OT_FillWithDefaultValues)
+    bpy.utils.register_class(AssetManagerPreferences)
+    bpy.utils.register_class(ASSET_OT_SavePreset)
+    bpy.utils.register_class(ASSET_OT_LoadPreset)
+    bpy.utils.register_class(ASSET_OT_DeletePreset)
+    bpy.utils.register_class(ASSET_OT_ApplyPreset)
+    bpy.utils.register_class(ASSET_OT_ExportMetadata)
+    bpy.utils.register_class(ASSET_OT_ImportMetadata)
     bpy.utils.register_class(ASSET_PT_MetadataManagerPanel)
+    bpy.utils.register_class(ASSET_OT_RegeneratePreviews)
+    bpy.utils.register_class(ASSET_PT_PreviewPanel)
+    bpy.utils.register_class(ASSET_PT_MetadataExchangePanel)
+
+    bpy.utils.register_class(ASSET_OT_UpdateIndex)
+    bpy.utils.register_class(ASSET_OT_QueryIndex)
+    bpy.utils.register_class(ASSET_OT_BatchLibrary)
+    bpy.utils.register_class(ASSET_OT_ValidateAssets)
+    bpy.utils.register_class(ASSET_OT_SelectValidationIssue)
+    bpy.utils.register_class(ASSET_OT_FixValidationIssue)
+    bpy.utils.register_class(ASSET_PT_LibraryBatchPanel)
+    bpy.utils.register_class(ASSET_PT_ValidationPanel)
 
 def unregister():
     del bpy.types.Scene.tag_input
@@ -282,10 +2212,35 @@ def unregister():
     del bpy.types.Scene.new_tag
     del bpy.types.Scene.single_words
 
+    del bpy.types.Scene.auto_tag_rules
+    del bpy.types.Scene.vocabulary_scope
+    del bpy.types.Scene.tag_mappings
+    del bpy.types.Scene.tag_mappings_index
+
     del bpy.types.Scene.asset_description
     del bpy.types.Scene.asset_license
     del bpy.types.Scene.asset_copyright
     del bpy.types.Scene.asset_author
+    del bpy.types.Scene.asset_preset
+    del bpy.types.Scene.preset_name
+    del bpy.types.Scene.preview_scope
+    del bpy.types.Scene.preview_size
+    del bpy.types.Scene.preview_force
+    del bpy.types.Scene.metadata_file
+    del bpy.types.Scene.metadata_scope
+
+    del bpy.types.Scene.library_path
+    del bpy.types.Scene.library_operation
+    del bpy.types.Scene.library_workers
+    del bpy.types.Scene.library_scope
+    del bpy.types.Scene.index_query_tag
+    del bpy.types.Scene.index_query_name
+    del bpy.types.Scene.index_query_missing
+    del bpy.types.Scene.index_results
+    del bpy.types.Scene.index_results_index
+    del bpy.types.Scene.validation_rules
+    del bpy.types.Scene.validation_scope
+    del bpy.types.Scene.validation_issues
 
     bpy.utils.unregister_class(ASSET_OT_AddTagToList)
     bpy.utils.unregister_class(ASSET_OT_RemoveTagFromList)
@@ -295,9 +2250,57 @@ def unregister():
     bpy.utils.unregister_class(ASSET_OT_ReplaceTag)
     bpy.utils.unregister_class(ASSET_PT_TagManagerPanel)
 
+    bpy.utils.unregister_class(ASSET_OT_AutoTag)
+    bpy.utils.unregister_class(ASSET_PT_AutoTagPanel)
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_auto_tags)
+    bpy.app.handlers.load_post.remove(reset_auto_tags)
+    bpy.app.handlers.undo_post.remove(clear_auto_tags)
+    bpy.app.handlers.redo_post.remove(clear_auto_tags)
+    bpy.msgbus.clear_by_owner(auto_tag_msgbus_owner)
+    bpy.app.handlers.load_post.remove(clear_validation_report)
+    auto_tag_cache.clear()
+
+    bpy.utils.unregister_class(ASSET_UL_TagMappings)
+    bpy.utils.unregister_class(ASSET_OT_CollectVocabulary)
+    bpy.utils.unregister_class(ASSET_OT_ApplyTagMapping)
+    bpy.utils.unregister_class(ASSET_PT_VocabularyPanel)
+
     bpy.utils.unregister_class(ASSET_OT_EditMetadata)
     bpy.utils.unregister_class(ASSET_OT_FillWithDefaultValues)
+    bpy.utils.unregister_class(AssetManagerPreferences)
+    bpy.utils.unregister_class(ASSET_OT_SavePreset)
+    bpy.utils.unregister_class(ASSET_OT_LoadPreset)
+    bpy.utils.unregister_class(ASSET_OT_DeletePreset)
+    bpy.utils.unregister_class(ASSET_OT_ApplyPreset)
+    bpy.utils.unregister_class(ASSET_OT_ExportMetadata)
+    bpy.utils.unregister_class(ASSET_OT_ImportMetadata)
     bpy.utils.unregister_class(ASSET_PT_MetadataManagerPanel)
+    bpy.utils.unregister_class(ASSET_OT_RegeneratePreviews)
+    bpy.utils.unregister_class(ASSET_PT_PreviewPanel)
+    bpy.utils.unregister_class(ASSET_PT_MetadataExchangePanel)
+
+    bpy.utils.unregister_class(ASSET_OT_UpdateIndex)
+    bpy.utils.unregister_class(ASSET_OT_QueryIndex)
+    bpy.utils.unregister_class(ASSET_OT_BatchLibrary)
+    bpy.utils.unregister_class(ASSET_OT_ValidateAssets)
+    bpy.utils.unregister_class(ASSET_OT_SelectValidationIssue)
+    bpy.utils.unregister_class(ASSET_OT_FixValidationIssue)
+    bpy.utils.unregister_class(ASSET_PT_LibraryBatchPanel)
+    bpy.utils.unregister_class(ASSET_PT_ValidationPanel)
+
+    bpy.utils.unregister_class(AssetIndexResult)
+    bpy.utils.unregister_class(AutoTagRules)
+    bpy.utils.unregister_class(TagMapping)
+    bpy.utils.unregister_class(ValidationRules)
+    bpy.utils.unregister_class(ValidationIssue)
 
 if __name__ == "__main__":
-    register()
+    # Background workers are started as: blender -b --python tagging_addon.py -- --worker job.json
+    parser = argparse.ArgumentParser(prog="tagging_addon.py")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+
+    if args.worker:
+        run_library_worker(args.worker)
+    else:
+        register()